@@ -0,0 +1,322 @@
+"""端到端基准测试套件
+
+使用本地替身服务器测量登录和模型同步链路上的关键耗时：
+
+- login_paint: 创建登录窗口到首次绘制完成
+- click_to_browser: 点击登录按钮到打开浏览器
+- websocket_login: 浏览器打开登录页到应用收到 token（WebSocket 往返）
+- manifest_check: 模型版本检查
+- download_chunks: 不同读取块大小下的下载吞吐量
+- config_lookup: 配置读取开销
+- logging: 日志写入吞吐量
+
+Qt 相关项目使用 offscreen 平台运行，未安装 PyQt5 或 websockets 时跳过。
+结果以 JSON 写入文件，可用 --compare 与其他提交的结果对比。
+
+用法:
+    python benchmarks/bench_e2e.py [--runs 5] [--output results.json] [--compare baseline.json]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import hashlib
+import argparse
+import platform
+import tempfile
+import subprocess
+import webbrowser
+from datetime import datetime
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
+
+# 无显示环境时 Qt 使用 offscreen 平台
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from utils.config import get_config  # noqa: E402
+from utils.logger import get_logger  # noqa: E402
+from utils.downloader import MirrorDownloader  # noqa: E402
+from core.model_sync import ModelSyncEngine  # noqa: E402
+from stub_servers import StubAuthServer, StubBrowser, ThrottledFileServer  # noqa: E402
+
+
+def summarize(samples):
+    """计算耗时样本的统计值（毫秒）"""
+    samples = sorted(samples)
+    return {
+        "runs": len(samples),
+        "min_ms": samples[0] * 1000,
+        "median_ms": samples[len(samples) // 2] * 1000,
+        "max_ms": samples[-1] * 1000,
+    }
+
+
+def bench_config_lookup(iterations):
+    """测量配置读取的单次开销"""
+    config = get_config()
+    results = {}
+    for name, lookup in (
+        ("get", lambda: config.get("Model", "model_dir", "models")),
+        ("getint", lambda: config.getint("Window", "login_width", 280)),
+        ("fallback", lambda: config.get("Missing", "key", "default")),
+    ):
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            lookup()
+        elapsed = time.perf_counter() - start_time
+        results[f"{name}_ns"] = elapsed / iterations * 1e9
+    return results
+
+
+def bench_logging(messages):
+    """测量日志写入吞吐量
+
+    DEBUG 日志只写入文件处理器，测量的是文件日志路径
+    """
+    logger = get_logger()
+    start_time = time.perf_counter()
+    for i in range(messages):
+        logger.debug(f"基准测试日志 {i}")
+    elapsed = time.perf_counter() - start_time
+    return {"messages": messages, "messages_per_second": messages / elapsed}
+
+
+def bench_manifest_check(runs):
+    """测量模型版本检查耗时，每次使用空的临时模型目录"""
+    samples = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as model_dir:
+            engine = ModelSyncEngine(model_dir=model_dir)
+            start_time = time.perf_counter()
+            asyncio.run(engine.check_version())
+            samples.append(time.perf_counter() - start_time)
+    return summarize(samples)
+
+
+def bench_download_chunks(size_mb, chunk_sizes, bandwidth_mb):
+    """测量不同读取块大小下从本地替身服务器下载的吞吐量"""
+    payload = os.urandom(size_mb * 1024 * 1024)
+    payload_hash = hashlib.sha256(payload).hexdigest()
+    server = ThrottledFileServer(
+        {"model.bin": payload}, bandwidth=int(bandwidth_mb * 1024 * 1024)
+    ).start()
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dest_path = os.path.join(tmp_dir, "model.bin")
+            for chunk_size in chunk_sizes:
+                downloader = MirrorDownloader(
+                    [f"{server.url}/model.bin"], chunk_size=chunk_size
+                )
+                start_time = time.perf_counter()
+                downloader.download(dest_path, expected_sha256=payload_hash)
+                elapsed = time.perf_counter() - start_time
+                results[str(chunk_size)] = {
+                    "seconds": elapsed,
+                    "throughput_mbps": size_mb / elapsed,
+                }
+    finally:
+        server.stop()
+    return results
+
+
+def bench_login(runs):
+    """测量登录窗口绘制、点击到打开浏览器和 WebSocket 登录往返的耗时
+
+    浏览器替身把登录页请求转给本地认证服务器替身，后者以 WebSocket 客户端发回 token。
+    只测量登录链路，登录成功后不进入模型加载流程。
+    """
+    from PyQt5.QtCore import QObject, QEvent, QEventLoop, QTimer
+    from PyQt5.QtWidgets import QApplication
+    from controllers.login_controller import LoginController
+    from utils.theme import get_theme
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    get_theme().apply(app)
+
+    auth_server = StubAuthServer().start()
+    browser = StubBrowser(auth_server)
+    webbrowser.register(browser.name, None, browser, preferred=True)
+
+    class PaintWatcher(QObject):
+        """记录窗口首次绘制的时间点"""
+
+        def __init__(self):
+            super().__init__()
+            self.painted_time = None
+
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and self.painted_time is None:
+                self.painted_time = time.perf_counter()
+            return False
+
+    paint_samples, click_samples, login_samples = [], [], []
+    try:
+        for _ in range(runs):
+            start_time = time.perf_counter()
+            controller = LoginController()
+            watcher = PaintWatcher()
+            controller.login_window.installEventFilter(watcher)
+            controller.show_login_window()
+            while watcher.painted_time is None:
+                if time.perf_counter() - start_time > 5:
+                    raise RuntimeError("登录窗口未在 5 秒内完成绘制")
+                app.processEvents(QEventLoop.AllEvents, 10)
+            paint_samples.append(watcher.painted_time - start_time)
+
+            # 只测量登录链路，不进入模型加载
+            received = {}
+            wait_loop = QEventLoop()
+            controller.login_success.disconnect()
+            controller.login_success.connect(
+                lambda utoken: (
+                    received.setdefault("time", time.perf_counter()),
+                    wait_loop.quit(),
+                )
+            )
+            QTimer.singleShot(10000, wait_loop.quit)
+
+            opened_count = len(browser.opened)
+            click_time = time.perf_counter()
+            controller.login_window.login_button.click()
+            wait_loop.exec_()
+            if "time" not in received or len(browser.opened) == opened_count:
+                raise RuntimeError("登录未在 10 秒内完成")
+            click_samples.append(browser.opened[-1] - click_time)
+            login_samples.append(received["time"] - browser.opened[-1])
+
+            # 关闭本次登录的 WebSocket 服务器和窗口
+            if controller.event_loop and controller.websocket_server:
+                controller.event_loop.call_soon_threadsafe(
+                    controller.websocket_server.close
+                )
+            controller.login_window.close()
+    finally:
+        auth_server.stop()
+
+    return {
+        "login_paint": summarize(paint_samples),
+        "click_to_browser": summarize(click_samples),
+        "websocket_login": summarize(login_samples),
+    }
+
+
+def qt_unavailable_reason():
+    """返回 Qt 相关测试无法运行的原因，可以运行时返回 None"""
+    for module in ("PyQt5", "websockets"):
+        try:
+            __import__(module)
+        except ImportError:
+            return f"{module} 未安装"
+    return None
+
+
+def git_revision():
+    """当前提交的哈希，无法获取时返回 None"""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten(results, prefix=""):
+    """把嵌套结果展开为 {"a.b.c": 数值}"""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(baseline, current):
+    """打印当前结果相对基线结果的变化"""
+    base = flatten(baseline["results"])
+    cur = flatten(current["results"])
+    print(
+        f"对比 {baseline['meta'].get('revision')} -> {current['meta'].get('revision')}"
+    )
+    for name in sorted(base.keys() & cur.keys()):
+        if name.endswith(".runs") or name.endswith(".messages"):
+            continue
+        change = (cur[name] - base[name]) / base[name] * 100 if base[name] else 0.0
+        print(f"  {name:<48} {base[name]:>12.3f} -> {cur[name]:>12.3f} ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="端到端基准测试套件")
+    parser.add_argument("--runs", type=int, default=5, help="耗时类测试的测量轮数")
+    parser.add_argument(
+        "--manifest-runs", type=int, default=3, help="版本检查的测量轮数"
+    )
+    parser.add_argument("--size-mb", type=int, default=64, help="下载测试文件大小（MB）")
+    parser.add_argument(
+        "--bandwidth-mb",
+        type=float,
+        default=0,
+        help="替身模型服务器每连接带宽（MB/s），0 表示不限速",
+    )
+    parser.add_argument(
+        "--chunk-sizes",
+        default="4096,16384,65536,262144,1048576",
+        help="下载读取块大小列表（字节，逗号分隔）",
+    )
+    parser.add_argument(
+        "--config-iterations", type=int, default=100000, help="配置读取次数"
+    )
+    parser.add_argument("--log-messages", type=int, default=5000, help="日志写入条数")
+    parser.add_argument("--skip-qt", action="store_true", help="跳过 Qt 相关测试")
+    parser.add_argument("--output", help="结果 JSON 文件路径，默认输出到标准输出")
+    parser.add_argument("--compare", help="用于对比的基线结果 JSON 文件")
+    args = parser.parse_args()
+
+    results = {
+        "config_lookup": bench_config_lookup(args.config_iterations),
+        "logging": bench_logging(args.log_messages),
+        "manifest_check": bench_manifest_check(args.manifest_runs),
+        "download_chunks": bench_download_chunks(
+            args.size_mb,
+            [int(size) for size in args.chunk_sizes.split(",")],
+            args.bandwidth_mb,
+        ),
+    }
+
+    reason = "--skip-qt" if args.skip_qt else qt_unavailable_reason()
+    if reason:
+        results["login"] = {"skipped": reason}
+    else:
+        results["login"] = bench_login(args.runs)
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+    else:
+        print(json.dumps(report, indent=4, ensure_ascii=False))
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
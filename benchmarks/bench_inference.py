@@ -0,0 +1,95 @@
+"""推理服务基准测试
+
+使用 DummyModel 测量不同批大小下的吞吐量和 p50/p99 延迟。
+
+用法:
+    python benchmarks/bench_inference.py [--requests 2000] [--clients 32] [--json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from utils.inference_service import InferenceService, DummyModel  # noqa: E402
+
+
+def percentile(values, pct):
+    """计算百分位数"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_case(batch_size, total_requests, clients, max_latency_ms):
+    """测量单个批大小下的吞吐量和延迟"""
+    service = InferenceService(
+        DummyModel, max_batch_size=batch_size, max_latency_ms=max_latency_ms
+    )
+    service.start()
+
+    latencies = []
+    latencies_lock = threading.Lock()
+    per_client = total_requests // clients
+
+    def client(client_id):
+        for i in range(per_client):
+            start = time.perf_counter()
+            service.submit(f"{client_id}-{i}".encode("utf-8")).result()
+            with latencies_lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    stats = service.get_stats()
+    service.stop()
+    return {
+        "batch_size": batch_size,
+        "requests": len(latencies),
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "average_batch_size": stats["average_batch_size"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="推理服务基准测试")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--max-latency-ms", type=float, default=5.0)
+    parser.add_argument(
+        "--batch-sizes", type=str, default="1,2,4,8,16,32", help="逗号分隔的批大小"
+    )
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    args = parser.parse_args()
+
+    results = [
+        run_case(int(size), args.requests, args.clients, args.max_latency_ms)
+        for size in args.batch_sizes.split(",")
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=4))
+        return
+
+    print(f"{'batch':>6} {'req/s':>10} {'p50(ms)':>9} {'p99(ms)':>9} {'avg batch':>10}")
+    for r in results:
+        print(
+            f"{r['batch_size']:>6} {r['throughput_rps']:>10.1f} {r['p50_ms']:>9.2f} "
+            f"{r['p99_ms']:>9.2f} {r['average_batch_size']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
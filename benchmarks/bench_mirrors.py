@@ -0,0 +1,114 @@
+"""多镜像下载基准测试
+
+启动多个限速的本地 HTTP 替身服务器（其中一个会在传输中途停滞），
+对比单镜像下载和多镜像分段并行下载的耗时与吞吐量，并校验下载结果。
+
+用法:
+    python benchmarks/bench_mirrors.py [--size-mb 32] [--json]
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from utils.downloader import MirrorDownloader  # noqa: E402
+from stub_servers import ThrottledFileServer  # noqa: E402
+
+
+def run_case(name, servers, dest_path, payload_hash, **options):
+    """下载一次并返回测量结果"""
+    downloader = MirrorDownloader(
+        [f"{server.url}/model.bin" for server in servers], **options
+    )
+    start = time.perf_counter()
+    downloader.download(dest_path, expected_sha256=payload_hash)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(dest_path)
+    return {
+        "case": name,
+        "seconds": elapsed,
+        "throughput_mbps": size / elapsed / 1024 / 1024,
+        "mirrors": downloader.get_mirror_stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多镜像下载基准测试")
+    parser.add_argument("--size-mb", type=int, default=32, help="测试文件大小（MB）")
+    parser.add_argument(
+        "--bandwidth-mb", type=float, default=8.0, help="每个镜像每连接带宽（MB/s）"
+    )
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    args = parser.parse_args()
+
+    payload = os.urandom(args.size_mb * 1024 * 1024)
+    payload_hash = hashlib.sha256(payload).hexdigest()
+    files = {"model.bin": payload}
+    bandwidth = int(args.bandwidth_mb * 1024 * 1024)
+
+    servers = [
+        ThrottledFileServer(files, bandwidth=bandwidth).start(),
+        ThrottledFileServer(files, bandwidth=bandwidth // 2, latency=0.02).start(),
+        ThrottledFileServer(files, bandwidth=bandwidth // 4, latency=0.05).start(),
+        # 测速正常，但每个连接传输 2MB 后停滞
+        ThrottledFileServer(
+            files, bandwidth=bandwidth * 2, stall_after=2 * 1024 * 1024
+        ).start(),
+    ]
+    options = {"segment_size": 4 * 1024 * 1024, "stall_timeout": 1.0}
+
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dest_path = os.path.join(tmp_dir, "model.bin")
+            results.append(
+                run_case(
+                    "single",
+                    servers[:1],
+                    dest_path,
+                    payload_hash,
+                    max_parallel=1,
+                    **options,
+                )
+            )
+            results.append(
+                run_case(
+                    "multi",
+                    servers,
+                    dest_path,
+                    payload_hash,
+                    max_parallel=4,
+                    **options,
+                )
+            )
+    finally:
+        for server in servers:
+            server.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=4))
+        return
+
+    for r in results:
+        print(
+            f"{r['case']:>7}: {r['seconds']:.2f}s, {r['throughput_mbps']:.1f}MB/s"
+        )
+        for m in r["mirrors"]:
+            latency = "-"
+            if m["latency_ms"] is not None:
+                latency = f"{m['latency_ms']:.0f}ms"
+            print(
+                f"         {m['url']}  latency={latency} "
+                f"probe={m['throughput'] / 1024 / 1024:.1f}MB/s "
+                f"failures={m['failures']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
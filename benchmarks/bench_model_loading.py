@@ -0,0 +1,112 @@
+"""模型加载基准测试
+
+对比读入内存和只读内存映射两种方式的就绪耗时、全量扫描耗时和内存占用。
+每种方式在独立子进程中运行，以获得准确的峰值 RSS。
+匿名内存（堆）只统计进程私有的内存，映射的文件页属于系统页缓存，可被多个进程共享。
+
+用法:
+    python benchmarks/bench_model_loading.py [--size-mb 256] [--json]
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+SRC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+CHILD_CODE = r"""
+import sys, time, json, resource
+sys.path.insert(0, sys.argv[1])
+mode, path = sys.argv[2], sys.argv[3]
+from utils.model_file import open_model_file
+
+def anonymous_kb():
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Anonymous:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+
+start = time.perf_counter()
+if mode == "read":
+    with open(path, "rb") as f:
+        data = f.read()
+    buffer = memoryview(data)
+else:
+    model_file = open_model_file(path)
+    buffer = model_file.buffer
+ready = time.perf_counter() - start
+
+# 按页访问整个文件，模拟推理时读取全部权重
+checksum = sum(buffer[::4096])
+scanned = time.perf_counter() - start
+
+print(json.dumps({
+    "mode": mode,
+    "ready_ms": ready * 1000,
+    "scan_ms": scanned * 1000,
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "anonymous_mb": (anonymous_kb() or 0) / 1024,
+}))
+"""
+
+
+def create_model_file(path, size_mb):
+    """生成测试用的模型文件"""
+    block = os.urandom(1024 * 1024)
+    with open(path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(block)
+
+
+def run_mode(mode, path):
+    """在子进程中加载模型并返回测量结果"""
+    output = subprocess.check_output(
+        [sys.executable, "-c", CHILD_CODE, SRC_DIR, mode, path],
+        stderr=subprocess.DEVNULL,
+    )
+    return json.loads(output.decode("utf-8").strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="模型加载基准测试")
+    parser.add_argument("--size-mb", type=int, default=256, help="测试文件大小（MB）")
+    parser.add_argument("--repeat", type=int, default=3, help="每种方式的重复次数")
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "model.bin")
+        create_model_file(path, args.size_mb)
+
+        results = []
+        for mode in ("read", "mmap"):
+            runs = [run_mode(mode, path) for _ in range(args.repeat)]
+            # 取就绪耗时最短的一次，排除页缓存冷启动的干扰
+            results.append(min(runs, key=lambda r: r["ready_ms"]))
+
+    if args.json:
+        print(json.dumps({"size_mb": args.size_mb, "results": results}, indent=4))
+        return
+
+    print(f"文件大小: {args.size_mb}MB")
+    print(
+        f"{'mode':>6} {'ready(ms)':>10} {'scan(ms)':>10} "
+        f"{'peak rss(MB)':>13} {'heap(MB)':>9}"
+    )
+    for r in results:
+        print(
+            f"{r['mode']:>6} {r['ready_ms']:>10.2f} {r['scan_ms']:>10.2f} "
+            f"{r['peak_rss_mb']:>13.1f} {r['anonymous_mb']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
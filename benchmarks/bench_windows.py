@@ -0,0 +1,129 @@
+"""窗口创建基准测试
+
+测量登录窗口和用户窗口从创建到首次绘制完成的耗时，以及应用级主题的一次性加载耗时。
+通过 --src 指向其他提交检出的 src 目录（例如 git worktree），可对比不同提交的结果。
+使用 offscreen 平台运行，不需要显示环境。
+
+用法:
+    python benchmarks/bench_windows.py [--runs 50] [--src 其他检出的 src 目录] [--json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+# 无显示环境时 Qt 使用 offscreen 平台
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def summarize(samples):
+    """计算耗时样本的统计值（毫秒），first_ms 为进程内首个窗口的耗时"""
+    first = samples[0]
+    samples = sorted(samples)
+    return {
+        "runs": len(samples),
+        "first_ms": first * 1000,
+        "min_ms": samples[0] * 1000,
+        "median_ms": samples[len(samples) // 2] * 1000,
+        "max_ms": samples[-1] * 1000,
+    }
+
+
+def time_to_paint(app, create):
+    """创建并显示窗口，返回 (窗口, 创建到首次绘制的耗时)"""
+    from PyQt5.QtCore import QObject, QEvent, QEventLoop
+
+    class PaintWatcher(QObject):
+        def __init__(self):
+            super().__init__()
+            self.painted_time = None
+
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint and self.painted_time is None:
+                self.painted_time = time.perf_counter()
+            return False
+
+    watcher = PaintWatcher()
+    start_time = time.perf_counter()
+    window = create()
+    window.installEventFilter(watcher)
+    window.show()
+    while watcher.painted_time is None:
+        if time.perf_counter() - start_time > 5:
+            raise RuntimeError("窗口未在 5 秒内完成绘制")
+        app.processEvents(QEventLoop.AllEvents, 10)
+    return window, watcher.painted_time - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="窗口创建基准测试")
+    parser.add_argument("--runs", type=int, default=50, help="测量轮数")
+    parser.add_argument(
+        "--src",
+        default=os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"),
+        help="被测代码的 src 目录",
+    )
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.abspath(args.src))
+    from PyQt5.QtWidgets import QApplication
+    from controllers.login_controller import LoginController
+    from views.user_window import UserWindow
+
+    app = QApplication(sys.argv[:1])
+
+    # 与 main.py 一致：有主题引擎时先加载应用级主题
+    theme_seconds = None
+    try:
+        from utils.theme import get_theme
+    except ImportError:
+        get_theme = None
+    if get_theme is not None:
+        start_time = time.perf_counter()
+        get_theme().apply(app)
+        theme_seconds = time.perf_counter() - start_time
+
+    login_samples, user_samples = [], []
+    for _ in range(args.runs):
+        controller = None
+
+        def create_login():
+            nonlocal controller
+            controller = LoginController()
+            return controller.login_window
+
+        window, elapsed = time_to_paint(app, create_login)
+        login_samples.append(elapsed)
+        window.close()
+
+        window, elapsed = time_to_paint(app, lambda: UserWindow("bench-token"))
+        user_samples.append(elapsed)
+        window.close()
+        app.processEvents()
+
+    results = {
+        "theme_apply_ms": theme_seconds * 1000 if theme_seconds is not None else None,
+        "login_window": summarize(login_samples),
+        "user_window": summarize(user_samples),
+    }
+    if args.json:
+        print(json.dumps(results, indent=4))
+        return
+
+    if theme_seconds is not None:
+        print(f"   主题加载: {theme_seconds * 1000:.2f}ms（一次性）")
+    for name, stats in (
+        ("登录窗口", results["login_window"]),
+        ("用户窗口", results["user_window"]),
+    ):
+        print(
+            f"   {name}: 首个 {stats['first_ms']:.2f}ms, min {stats['min_ms']:.2f}ms, "
+            f"median {stats['median_ms']:.2f}ms, max {stats['max_ms']:.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
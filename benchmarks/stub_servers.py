@@ -0,0 +1,208 @@
+"""基准测试使用的本地替身服务器"""
+
+import re
+import json
+import time
+import asyncio
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class ThrottledFileServer:
+    """可限速的本地 HTTP 文件服务器，支持区间请求
+
+    Args:
+        files: 文件名 -> bytes 的字典，通过 /<文件名> 访问
+        bandwidth: 每个连接的带宽上限（字节/秒），0 表示不限速
+        latency: 每个请求的额外延迟（秒）
+        stall_after: 每个连接发送该字节数后停止发送（模拟传输中途停滞），0 表示不停滞
+    """
+
+    def __init__(self, files, bandwidth=0, latency=0.0, stall_after=0):
+        self.files = files
+        self.bandwidth = bandwidth
+        self.latency = latency
+        self.stall_after = stall_after
+        self.bytes_sent = 0
+        self._stopped = threading.Event()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                data = server.files.get(self.path.lstrip("/"))
+                if data is None:
+                    self.send_error(404)
+                    return
+                time.sleep(server.latency)
+
+                start, end = 0, len(data)
+                match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+                if match:
+                    start = int(match.group(1))
+                    if match.group(2):
+                        end = min(int(match.group(2)) + 1, len(data))
+                    self.send_response(206)
+                    self.send_header(
+                        "Content-Range", f"bytes {start}-{end - 1}/{len(data)}"
+                    )
+                else:
+                    self.send_response(200)
+                self.send_header("Content-Length", str(end - start))
+                self.end_headers()
+                server._send(self.wfile, data[start:end])
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def _send(self, wfile, payload, chunk_size=16 * 1024):
+        """按带宽上限分块发送"""
+        sent = 0
+        start = time.perf_counter()
+        try:
+            while sent < len(payload):
+                if self.stall_after and sent >= self.stall_after:
+                    # 保持连接但不再发送数据，直到服务器停止
+                    self._stopped.wait()
+                    return
+                chunk = payload[sent : sent + chunk_size]
+                wfile.write(chunk)
+                sent += len(chunk)
+                self.bytes_sent += len(chunk)
+                if self.bandwidth:
+                    expected = sent / self.bandwidth
+                    elapsed = time.perf_counter() - start
+                    if expected > elapsed:
+                        time.sleep(expected - elapsed)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class StubAuthServer:
+    """本地认证服务器替身
+
+    模拟浏览器中的登录页：收到 /login?ws_port=<端口> 请求后立即返回页面，
+    并在后台线程中以 WebSocket 客户端连接应用的本地端口发送 {"utoken": ...}。
+    每次登录的时间点记录在 logins 列表中，便于测量往返耗时。
+
+    Args:
+        utoken: 登录成功后发送给应用的 token
+        latency: 模拟用户在登录页上操作的延迟（秒）
+    """
+
+    def __init__(self, utoken="bench-token", latency=0.0):
+        self.utoken = utoken
+        self.latency = latency
+        self.logins = []
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                ws_port = parse_qs(url.query).get("ws_port", [None])[0]
+                if url.path != "/login" or not ws_port:
+                    self.send_error(404)
+                    return
+                body = b"<html><body>login</body></html>"
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                # 页面返回后再连接，应用的事件循环在打开浏览器时不会被阻塞
+                threading.Thread(
+                    target=server._send_token, args=(int(ws_port),), daemon=True
+                ).start()
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def _send_token(self, ws_port):
+        """以 WebSocket 客户端连接应用并发送 token"""
+        import websockets
+
+        record = {"page_time": time.perf_counter()}
+        time.sleep(self.latency)
+
+        async def send():
+            async with websockets.connect(f"ws://localhost:{ws_port}") as websocket:
+                record["connected_time"] = time.perf_counter()
+                await websocket.send(json.dumps({"utoken": self.utoken}))
+                record["sent_time"] = time.perf_counter()
+                # 等待应用关闭连接，应用处理完 token 后会结束该连接
+                try:
+                    await asyncio.wait_for(websocket.wait_closed(), timeout=5)
+                except asyncio.TimeoutError:
+                    pass
+
+        try:
+            asyncio.run(send())
+        except Exception as e:
+            record["error"] = str(e)
+        with self._lock:
+            self.logins.append(record)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class StubBrowser:
+    """浏览器替身，可通过 webbrowser.register 注册
+
+    把应用打开的登录 URL 的地址换成本地认证服务器替身后直接请求，
+    并记录每次被打开的时间点。
+    """
+
+    def __init__(self, auth_server):
+        self.auth_server = auth_server
+        self.name = "stub"
+        self.opened = []
+
+    def open(self, url, new=0, autoraise=True):
+        import urllib.request
+
+        self.opened.append(time.perf_counter())
+        parsed = urlparse(url)
+        stub_url = f"{self.auth_server.url}{parsed.path}?{parsed.query}"
+        with urllib.request.urlopen(stub_url, timeout=5) as response:
+            response.read()
+        return True
+
+    def open_new(self, url):
+        return self.open(url, 1)
+
+    def open_new_tab(self, url):
+        return self.open(url, 2)
@@ -0,0 +1,283 @@
+"""无界面命令行入口
+
+不依赖 Qt 和显示环境，可在 cron 中预装模型或在 CI 中测量同步流程的耗时。
+
+用法:
+    python src/cli.py sync-models [--utoken TOKEN] [--model-dir DIR] [--prefetch] [--gc] [--json]
+    python src/cli.py bench [--runs 3] [--mirror URL] [--size-mb 32] [--json]
+    python src/cli.py gc [--model-dir DIR] [--json]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import hashlib
+import tempfile
+from core.model_sync import ModelSyncEngine
+from utils.logger import get_logger
+
+
+class ProgressPrinter:
+    """把同步引擎的回调输出为文本或 JSON 行"""
+
+    def __init__(self, as_json):
+        self.as_json = as_json
+
+    def emit(self, event, **fields):
+        """输出一个事件"""
+        if self.as_json:
+            print(json.dumps({"event": event, **fields}, ensure_ascii=False), flush=True)
+            return
+        if event == "download_started":
+            print("开始下载模型", flush=True)
+        elif event == "progress":
+            print(f"下载进度: {fields['value']}%", flush=True)
+        elif event == "done":
+            state = "已更新到" if fields["updated"] else "已是最新版本"
+            print(
+                f"模型{state} {fields['version']} ({fields['seconds']:.2f}s)",
+                flush=True,
+            )
+        elif event == "gc":
+            print(f"已清理旧版本模型 {fields['freed_bytes']} 字节", flush=True)
+        elif event == "error":
+            print(f"错误: {fields['message']}", file=sys.stderr, flush=True)
+        else:
+            print(f"{event}: {fields}", flush=True)
+
+
+def create_engine(args, printer=None):
+    """按命令行参数创建同步引擎"""
+    return ModelSyncEngine(
+        model_dir=getattr(args, "model_dir", None),
+        utoken=getattr(args, "utoken", None),
+        on_progress=(lambda value: printer.emit("progress", value=value))
+        if printer
+        else None,
+        on_download_started=(lambda: printer.emit("download_started"))
+        if printer
+        else None,
+    )
+
+
+def cmd_sync_models(args):
+    """检查版本并下载、激活最新模型"""
+    printer = ProgressPrinter(args.json)
+    engine = create_engine(args, printer)
+    try:
+        start_time = time.perf_counter()
+        updated, latest_version = asyncio.run(engine.sync())
+        printer.emit(
+            "done",
+            updated=updated,
+            version=latest_version["version"],
+            model_path=engine.get_model_file_path(),
+            seconds=time.perf_counter() - start_time,
+        )
+        if args.prefetch and latest_version.get("next"):
+            # 无界面运行时没有用户活动，不等待空闲
+            if not engine.run_prefetch(latest_version["next"], idle_seconds=0):
+                raise Exception("预取下一个版本失败，详见日志")
+            printer.emit("prefetch", version=latest_version["next"]["version"])
+        if args.gc:
+            printer.emit("gc", freed_bytes=run_garbage_collection(engine))
+    except Exception as e:
+        printer.emit("error", message=str(e))
+        return 1
+    return 0
+
+
+def run_garbage_collection(engine):
+    """执行垃圾回收，失败时抛出异常
+    返回: int - 释放的字节数
+    """
+    freed = engine.run_garbage_collection()
+    if freed is None:
+        raise Exception("清理旧版本模型失败，详见日志")
+    return freed
+
+
+def cmd_gc(args):
+    """按配置 [ModelGC] 清理旧版本模型文件"""
+    printer = ProgressPrinter(args.json)
+    engine = create_engine(args)
+    try:
+        printer.emit("gc", freed_bytes=run_garbage_collection(engine))
+    except Exception as e:
+        printer.emit("error", message=str(e))
+        return 1
+    return 0
+
+
+def _summary(samples):
+    """计算耗时样本的统计值（毫秒）"""
+    samples = sorted(samples)
+    return {
+        "runs": len(samples),
+        "min_ms": samples[0] * 1000,
+        "median_ms": samples[len(samples) // 2] * 1000,
+        "max_ms": samples[-1] * 1000,
+    }
+
+
+def _positive_int(value):
+    """argparse 参数类型：不小于 1 的整数"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"必须不小于 1: {value}")
+    return number
+
+
+def _start_stub_mirror(model_name, size_mb):
+    """启动本地替身镜像（benchmarks/stub_servers.py），提供随机内容的模型文件
+
+    返回: (ThrottledFileServer, str) - (已启动的服务器, 文件的 SHA-256)
+    """
+    sys.path.insert(
+        0,
+        os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"
+        ),
+    )
+    from stub_servers import ThrottledFileServer
+
+    payload = os.urandom(size_mb * 1024 * 1024)
+    server = ThrottledFileServer({model_name: payload}).start()
+    return server, hashlib.sha256(payload).hexdigest()
+
+
+def cmd_bench(args):
+    """测量模型下载流程的耗时
+
+    通过 MirrorDownloader 从 --mirror 指定的镜像下载，未指定时从本地替身镜像下载。
+    每轮使用一个空的临时模型目录，测量首次下载（分段下载、校验并激活）
+    和再次登录时的模型文件检查（文件未变化时不重新计算哈希）的耗时。
+    不经过共享缓存，版本检查目前是模拟请求，不计入。
+    """
+    server = None
+    mirrors, expected_sha256 = args.mirror, args.sha256
+    if not mirrors:
+        server, expected_sha256 = _start_stub_mirror(args.model_name, args.size_mb)
+        mirrors = [server.url]
+    version_info = {
+        "version": "bench",
+        "model_name": args.model_name,
+        "timestamp": "",
+        "mirrors": mirrors,
+    }
+    if expected_sha256:
+        version_info["sha256"] = expected_sha256
+
+    download_samples, verify_samples = [], []
+    size_bytes = 0
+    try:
+        for _ in range(args.runs):
+            with tempfile.TemporaryDirectory() as model_dir:
+                args.model_dir = model_dir
+                engine = create_engine(args)
+                engine.use_shared_cache = False
+
+                start_time = time.perf_counter()
+                asyncio.run(engine.download(version_info))
+                download_samples.append(time.perf_counter() - start_time)
+                size_bytes = os.path.getsize(engine.get_model_file_path())
+
+                start_time = time.perf_counter()
+                if not engine.verify_model_file():
+                    raise Exception("模型文件校验失败")
+                verify_samples.append(time.perf_counter() - start_time)
+    except Exception as e:
+        ProgressPrinter(args.json).emit("error", message=str(e))
+        return 1
+    finally:
+        if server:
+            server.stop()
+
+    median_seconds = sorted(download_samples)[len(download_samples) // 2]
+    results = {
+        "mirrors": mirrors,
+        "size_bytes": size_bytes,
+        "download": _summary(download_samples),
+        "download_throughput_mbps": size_bytes / 1024 / 1024 / median_seconds,
+        "verify_warm": _summary(verify_samples),
+    }
+    if args.json:
+        print(json.dumps(results, indent=4))
+        return 0
+    print(f"镜像: {', '.join(mirrors)}，文件大小 {size_bytes} 字节")
+    for name in ("download", "verify_warm"):
+        stats = results[name]
+        print(
+            f"{name:>14}: min {stats['min_ms']:.1f}ms, "
+            f"median {stats['median_ms']:.1f}ms, max {stats['max_ms']:.1f}ms"
+        )
+    print(f"{'throughput':>14}: {results['download_throughput_mbps']:.1f}MB/s")
+    return 0
+
+
+def build_parser():
+    """构建命令行解析器"""
+    parser = argparse.ArgumentParser(description="CTC-AI 无界面命令行工具")
+    parser.add_argument(
+        "--quiet", action="store_true", help="控制台只输出警告及以上级别的日志"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = subparsers.add_parser("sync-models", help="检查并同步最新模型")
+    sync_parser.add_argument(
+        "--utoken",
+        default=os.environ.get("CTC_UTOKEN"),
+        help="用户 token，下载时以 Authorization 请求头发送（默认读取环境变量 CTC_UTOKEN）",
+    )
+    sync_parser.add_argument("--model-dir", help="模型目录，默认使用配置 [Model] model_dir")
+    sync_parser.add_argument(
+        "--prefetch", action="store_true", help="同步后预取版本清单预告的下一个版本"
+    )
+    sync_parser.add_argument("--gc", action="store_true", help="同步后清理旧版本模型")
+    sync_parser.add_argument("--json", action="store_true", help="以 JSON 行输出进度")
+    sync_parser.set_defaults(func=cmd_sync_models)
+
+    bench_parser = subparsers.add_parser("bench", help="测量模型下载流程的耗时")
+    bench_parser.add_argument(
+        "--utoken", default=os.environ.get("CTC_UTOKEN"), help="用户 token"
+    )
+    bench_parser.add_argument("--runs", type=_positive_int, default=3, help="测量轮数")
+    bench_parser.add_argument(
+        "--mirror",
+        action="append",
+        help="镜像地址（不含文件名），可重复指定；不指定时启动本地替身镜像",
+    )
+    bench_parser.add_argument(
+        "--model-name", default="model_1201.pt", help="镜像上的模型文件名"
+    )
+    bench_parser.add_argument("--sha256", help="使用 --mirror 时模型文件的 SHA-256")
+    bench_parser.add_argument(
+        "--size-mb", type=_positive_int, default=32, help="本地替身镜像的文件大小（MB）"
+    )
+    bench_parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    bench_parser.set_defaults(func=cmd_bench)
+
+    gc_parser = subparsers.add_parser("gc", help="清理旧版本模型文件")
+    gc_parser.add_argument("--model-dir", help="模型目录，默认使用配置 [Model] model_dir")
+    gc_parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    gc_parser.set_defaults(func=cmd_gc)
+    return parser
+
+
+def main():
+    """命令行入口点"""
+    args = build_parser().parse_args()
+    if args.quiet:
+        for handler in get_logger().handlers:
+            # RotatingFileHandler 也是 StreamHandler 的子类，只调整控制台处理器
+            if type(handler) is logging.StreamHandler:
+                handler.setLevel(logging.WARNING)
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import os
+import itertools
+from threading import Thread
+from concurrent.futures import Future
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from utils.logger import get_logger
+from utils.config import get_config
+from utils.inference_service import InferenceService
+from utils.result_cache import ResultCache
+from utils.activity import get_activity_monitor
+
+
+class InferenceController(QObject):
+    """推理控制器，为视图提供基于信号的推理接口"""
+
+    # 定义信号
+    result_ready = pyqtSignal(int, object)  # 推理完成信号 (请求ID, 结果)
+    inference_failed = pyqtSignal(int, str)  # 推理失败信号 (请求ID, 错误信息)
+    _future_done = pyqtSignal(int, object)  # 内部信号 (请求ID, Future)，排队到主线程
+
+    def __init__(self, model_controller, version_info=None):
+        super().__init__()
+        self.logger = get_logger()
+        self.config = get_config()
+        self.model_controller = model_controller
+        self.version_info = version_info or model_controller.current_model
+        self._request_ids = itertools.count(1)
+        # 始终排队处理：缓存命中或提交失败时 Future 已完成，也要在 submit() 返回请求ID之后才发信号
+        self._future_done.connect(self._on_future_done, Qt.QueuedConnection)
+
+        self.result_cache = self._create_result_cache()
+        self.service = InferenceService(
+            self._create_model,
+            max_batch_size=self.config.getint("Inference", "max_batch_size", 8),
+            max_latency_ms=self.config.getfloat("Inference", "max_latency_ms", 5.0),
+            num_workers=self.config.getint("Inference", "num_workers", 1),
+            result_cache=self.result_cache,
+            model_version=self.version_info["version"] if self.version_info else None,
+        )
+
+    def _create_result_cache(self):
+        """根据配置创建推理结果缓存，并绑定当前模型版本"""
+        if not self.config.getboolean("InferenceCache", "enabled", True):
+            return None
+
+        disk_path = None
+        if self.config.getboolean("InferenceCache", "disk_enabled", False):
+            disk_path = os.path.join(
+                os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                self.config.get("InferenceCache", "disk_path", "cache/results.db"),
+            )
+        result_cache = ResultCache(
+            memory_entries=self.config.getint(
+                "InferenceCache", "memory_entries", 1024
+            ),
+            disk_path=disk_path,
+            disk_max_bytes=self.config.getint(
+                "InferenceCache", "disk_max_bytes", 256 * 1024 * 1024
+            ),
+        )
+        if self.version_info:
+            result_cache.bind_version(self.version_info["version"])
+        return result_cache
+
+    def _create_model(self):
+        """在推理线程中通过模型缓存获取模型
+
+        推理服务停止或换下模型时调用其 close()，只取消缓存固定，模型仍留在缓存中
+        """
+        return self.model_controller.load_model(self.version_info)
+
+    def swap_model(self, version_info):
+        """热切换到新版本模型，新模型在后台线程中加载，不中断正在进行的推理"""
+        self.logger.info(f"开始热切换模型到版本 {version_info['version']}")
+        swap_thread = Thread(target=self._swap_model, args=(version_info,))
+        swap_thread.daemon = True
+        swap_thread.start()
+
+    def _swap_model(self, version_info):
+        """加载新模型并切换，旧模型空闲后取消缓存固定
+
+        切换回模型缓存中已有的版本时直接使用已构建的模型，不重新构建
+        """
+        # 初始模型创建时读取 self.version_info，等其完成后再替换
+        self.service.wait_ready()
+        try:
+            model = self.model_controller.load_model(version_info)
+        except Exception as e:
+            self.logger.error(f"加载新版本模型错误: {str(e)}")
+            return
+
+        self.version_info = version_info
+        try:
+            self.service.swap_model(model, version_info["version"])
+        except RuntimeError as e:
+            self.logger.error(f"切换推理模型错误: {str(e)}")
+            if hasattr(model, "close"):
+                model.close()
+
+    def start(self):
+        """启动推理服务，模型在后台线程中加载"""
+        self.logger.info("启动推理服务")
+        self.service.start(wait=False)
+
+    def stop(self):
+        """停止推理服务"""
+        self.service.stop()
+        if self.result_cache is not None:
+            self.logger.info(f"推理结果缓存统计: {self.result_cache.get_stats()}")
+            self.result_cache.close()
+
+    def submit(self, data):
+        """提交推理请求
+
+        返回: int - 请求ID，结果通过 result_ready / inference_failed 信号返回，
+              信号总是在本方法返回之后才发出（包括缓存命中时）
+        """
+        request_id = next(self._request_ids)
+        future = self.submit_future(data)
+        future.add_done_callback(
+            lambda f, request_id=request_id: self._future_done.emit(request_id, f)
+        )
+        return request_id
+
+    def submit_future(self, data):
+        """提交推理请求，直接返回 Future
+
+        服务不可用时返回带有异常的 Future，不在调用线程中抛出
+        """
+        get_activity_monitor().notify()
+        try:
+            return self.service.submit(data)
+        except Exception as e:
+            self.logger.error(f"提交推理请求错误: {str(e)}")
+            future = Future()
+            future.set_exception(e)
+            return future
+
+    def _on_future_done(self, request_id, future):
+        """推理完成后在主线程中发出结果信号"""
+        error = future.exception()
+        if error is not None:
+            self.inference_failed.emit(request_id, str(error))
+        else:
+            self.result_ready.emit(request_id, future.result())
@@ -2,14 +2,16 @@ import asyncio
 import websockets
 import json
 import socket
+import time
 import webbrowser
 from threading import Thread, Lock
-from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
 from utils.logger import get_logger
 from utils.config import get_config
 from views.login_window import LoginWindow
 from views.user_window import UserWindow
 from controllers.model_controller import ModelController
+from controllers.inference_controller import InferenceController
 
 
 class LoginController(QObject):
@@ -35,6 +37,9 @@ class LoginController(QObject):
         self.login_window = None
         self.user_window = None
 
+        # 推理控制器，模型加载完成后创建
+        self.inference_controller = None
+
         # 连接信号到槽
         self.login_success.connect(self._on_login_success)
 
@@ -49,28 +54,14 @@ class LoginController(QObject):
                 self.config.getint("Window", "login_width", 280),
                 self.config.getint("Window", "login_height", 400),
             ),
-            "window_background": self.config.get(
-                "LoginStyle", "window_background", "white"
-            ),
-            "login_button_background": self.config.get(
-                "LoginStyle", "login_button_background", "#07C160"
-            ),
-            "login_button_hover": self.config.get(
-                "LoginStyle", "login_button_hover", "#06B057"
-            ),
-            "login_button_pressed": self.config.get(
-                "LoginStyle", "login_button_pressed", "#059A4C"
-            ),
-            "title_label_color": self.config.get(
-                "LoginStyle", "title_label_color", "#353535"
-            ),
-            "status_label_color": self.config.get(
-                "LoginStyle", "status_label_color", "#888888"
-            ),
             "login_button_text": self.config.get("UI", "login_button_text", "登录"),
         }
 
+        start_time = time.perf_counter()
         self.login_window = LoginWindow(window_config)
+        self.logger.debug(
+            f"登录窗口创建耗时: {(time.perf_counter() - start_time) * 1000:.2f}ms"
+        )
         self.login_window.login_clicked.connect(self.start_login)
 
     def show_login_window(self):
@@ -242,7 +233,7 @@ class LoginController(QObject):
         self.current_utoken = utoken
 
         # 创建模型控制器并开始加载
-        self.model_controller = ModelController(self.login_window)
+        self.model_controller = ModelController(self.login_window, utoken)
         self.model_controller.model_load_complete.connect(self._on_model_load_complete)
         self.model_controller.start_model_loading()
 
@@ -250,11 +241,37 @@ class LoginController(QObject):
         """模型加载完成后的处理"""
         self.logger.info("模型加载完成，创建用户窗口")
 
+        # 创建推理控制器，模型在后台线程中加载
+        self.inference_controller = InferenceController(self.model_controller)
+        self.inference_controller.start()
+
         # 创建并显示用户窗口
-        self.user_window = UserWindow(self.current_utoken)
+        start_time = time.perf_counter()
+        self.user_window = UserWindow(self.current_utoken, self.inference_controller)
+        self.logger.debug(
+            f"用户窗口创建耗时: {(time.perf_counter() - start_time) * 1000:.2f}ms"
+        )
         self.user_window.show()
         self.login_window.hide_window()
 
+        # 定期在后台检查模型更新，新版本激活后热切换，无需重新登录
+        self.model_controller.model_updated.connect(
+            self.inference_controller.swap_model
+        )
+        interval = self.config.getint("Model", "update_check_interval", 3600)
+        if interval > 0:
+            self.update_timer = QTimer(self)
+            self.update_timer.timeout.connect(
+                self.model_controller.start_background_update
+            )
+            self.update_timer.start(interval * 1000)
+
+        # 用户窗口显示后延迟清理旧版本模型文件
+        gc_delay = self.config.getint("ModelGC", "start_delay", 30)
+        QTimer.singleShot(
+            gc_delay * 1000, self.model_controller.start_garbage_collection
+        )
+
     def cleanup_server(self):
         """清理服务器资源"""
         self.logger.info("正在清理服务器资源")
@@ -1,102 +1,77 @@
-import os
-import json
 import asyncio
 from threading import Thread
 from PyQt5.QtCore import QObject, pyqtSignal
 from utils.logger import get_logger
 from utils.config import get_config
+from core.model_sync import ModelSyncEngine
 from views.loading_window import LoadingWindow
 
 
 class ModelController(QObject):
-    """模型控制器，负责模型的检查、下载和加载"""
+    """模型控制器，负责模型的检查、下载和加载
+
+    同步逻辑由 ModelSyncEngine 完成，控制器把引擎的回调转换为 Qt 信号并管理加载窗口
+    """
 
     # 定义信号
     model_load_complete = pyqtSignal()  # 模型加载完成信号
     progress_updated = pyqtSignal(int)  # 进度更新信号
+    model_updated = pyqtSignal(dict)  # 后台更新激活新版本信号，参数为新版本信息
+    download_started = pyqtSignal()  # 开始实际下载信号
 
-    def __init__(self, parent_window=None):
+    def __init__(self, parent_window=None, utoken=None):
         super().__init__()
         self.logger = get_logger()
         self.config = get_config()
         self.parent_window = parent_window
         self.loading_window = None
+        self.is_foreground_loading = False  # 是否处于登录后的前台加载流程
 
-        # 模型信息
-        self.model_dir = self.config.get("Model", "model_dir", "models")
-        self.version_file = "version.json"  # 固定的版本文件名
-        self.current_model = None  # 当前模型信息，从版本文件中读取
-
-        # 确保模型目录存在
-        os.makedirs(self.model_dir, exist_ok=True)
+        # 引擎的回调在工作线程中调用，通过信号转到主线程
+        self.engine = ModelSyncEngine(
+            utoken=utoken,
+            on_progress=self.progress_updated.emit,
+            on_download_started=self.download_started.emit,
+        )
 
         # 连接进度信号到槽
         self.progress_updated.connect(self._update_progress)
+        self.download_started.connect(self._show_loading_window)
 
-    def _get_version_file_path(self):
-        """获取版本文件的完整路径"""
-        return os.path.join(self.model_dir, self.version_file)
+    @property
+    def current_model(self):
+        """当前模型信息"""
+        return self.engine.current_model
 
-    def _get_model_file_path(self):
+    def get_model_file_path(self):
         """获取模型文件的完整路径"""
-        if not self.current_model:
-            return None
-        return os.path.join(self.model_dir, self.current_model.get("model_name"))
-
-    def _read_local_version(self):
-        """读取本地版本信息
-        返回: (bool, dict) - (是否成功, 版本信息)
-        """
-        version_file = self._get_version_file_path()
-        try:
-            if not os.path.exists(version_file):
-                self.logger.info("版本文件不存在")
-                return False, None
-
-            with open(version_file, "r", encoding="utf-8") as f:
-                version_info = json.load(f)
-
-            # 验证版本信息格式
-            required_fields = ["version", "model_name", "timestamp"]
-            if not all(field in version_info for field in required_fields):
-                self.logger.error("版本文件格式错误")
-                return False, None
-
-            # 更新当前模型信息
-            self.current_model = version_info
-            return True, version_info
+        return self.engine.get_model_file_path()
 
-        except (json.JSONDecodeError, IOError) as e:
-            self.logger.error(f"读取版本文件错误: {str(e)}")
-            return False, None
-
-    def _save_version_info(self, version_info):
-        """保存版本信息到文件"""
-        try:
-            with open(self._get_version_file_path(), "w", encoding="utf-8") as f:
-                json.dump(version_info, f, indent=4)
-            # 更新当前模型信息
-            self.current_model = version_info
-            return True
-        except IOError as e:
-            self.logger.error(f"保存版本文件错误: {str(e)}")
-            return False
+    def load_model(self, version_info=None):
+        """通过模型缓存获取推理后端模型，默认加载当前版本，用完后调用其 close()"""
+        return self.engine.load_model(version_info)
 
     def start_model_loading(self):
         """开始模型加载流程"""
         self.logger.info("开始加载模型流程")
 
-        # 创建加载窗口（在主线程中）
-        self.loading_window = LoadingWindow()
-        if self.parent_window:
-            self.loading_window.center_on_parent(self.parent_window)
-        self.loading_window.show()
+        # 加载窗口只在需要实际下载时显示，见 _show_loading_window
+        self.is_foreground_loading = True
 
         # 在新线程中启动模型加载
         self.load_thread = Thread(target=self._run_model_loading)
         self.load_thread.daemon = True
         self.load_thread.start()
 
+    def _show_loading_window(self):
+        """前台加载需要下载模型时，在主线程中创建并显示加载窗口"""
+        if not self.is_foreground_loading or self.loading_window:
+            return
+        self.loading_window = LoadingWindow()
+        if self.parent_window:
+            self.loading_window.center_on_parent(self.parent_window)
+        self.loading_window.show()
+
     def _update_progress(self, value):
         """在主线程中更新进度"""
         if self.loading_window:
@@ -116,71 +91,75 @@ class ModelController(QObject):
             # 发送错误进度
             self.progress_updated.emit(-1)
 
-    async def _check_model_version(self):
-        """检查模型版本
-        返回: (bool, dict) - (是否需要更新, 最新版本信息)
+    def start_prefetch(self, version_info):
+        """在后台低优先级预取版本清单预告的下一个版本"""
+        self.engine.start_prefetch(version_info)
+
+    def start_garbage_collection(self):
+        """在低优先级后台线程中清理旧版本模型文件"""
+        self.engine.start_garbage_collection()
+
+    def start_background_update(self):
+        """在后台检查并安装新版本，不显示加载窗口
+
+        新版本激活后发出 model_updated 信号，由推理控制器热切换到新模型
+        """
+        if self.engine.is_update_in_progress:
+            self.logger.debug("后台更新已在进行中")
+            return
+        self.engine.is_update_in_progress = True
+        self.update_thread = Thread(target=self._run_background_update)
+        self.update_thread.daemon = True
+        self.update_thread.start()
+
+    def _run_background_update(self):
+        """在单独的线程中运行后台更新
+
+        激活新版本后，或垃圾回收因本次更新被跳过时，更新结束后清理旧版本
         """
-        self.logger.info("正在检查模型版本...")
-
-        # 读取本地版本信息
-        local_success, local_version = self._read_local_version()
-
-        # TODO: 实现实际的版本检查逻辑
-        # 1. 向服务器发送请求，获取最新版本信息
-        await asyncio.sleep(1)  # 模拟网络请求
-
-        # 模拟服务器返回的新版本信息
-        server_version = {
-            "version": "1.0.0",
-            "model_name": "model_1201.pt",
-            "timestamp": "2023-12-01T12:00:00Z",
-        }
-
-        # 如果本地版本读取失败，需要更新
-        if not local_success:
-            return True, server_version
-
-        # 比较版本
-        return server_version["version"] != local_version["version"], server_version
-
-    async def _download_model(self, version_info):
-        """下载模型"""
-        self.logger.info("开始下载模型...")
-
-        # TODO: 实现实际的模型下载逻辑
-        # 1. 下载模型文件
-        # 2. 验证文件完整性
-        # 3. 保存到指定位置
-        model_path = os.path.join(self.model_dir, version_info["model_name"])
-
-        # 模拟下载进度
-        for i in range(0, 101, 10):
-            await asyncio.sleep(1)
-            self.progress_updated.emit(i)
-            self.logger.info(f"下载进度：{i}%")
-
-        # 保存版本信息
-        if self._save_version_info(version_info):
-            self.logger.info(f"模型已保存到: {model_path}")
-        else:
-            raise Exception("保存版本信息失败")
+        activated = False
+        try:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            activated = loop.run_until_complete(self._update_model())
+        except Exception as e:
+            self.logger.error(f"后台更新错误: {str(e)}")
+        finally:
+            self.engine.is_update_in_progress = False
+        if activated or self.engine.is_gc_pending:
+            self.engine.is_gc_pending = False
+            self.start_garbage_collection()
+
+    async def _update_model(self):
+        """检查版本，有新版本时下载并激活
+        返回: bool - 是否激活了新版本
+        """
+        need_update, latest_version = await self.engine.check_version()
+        if not need_update:
+            self.logger.debug("后台更新检查：模型已是最新版本")
+            self.start_prefetch(latest_version)
+            return False
+
+        self.logger.info(f"后台更新：发现新版本 {latest_version['version']}")
+        await self.engine.download(latest_version)
+        self.model_updated.emit(latest_version)
+        self.start_prefetch(latest_version)
+        return True
 
     async def _load_models(self):
         """检查并加载模型"""
         try:
-            need_update, latest_version = await self._check_model_version()
-
-            if need_update:
-                self.logger.info("模型需要更新")
-                await self._download_model(latest_version)
-            else:
-                self.logger.info("模型已是最新版本")
+            updated, latest_version = await self.engine.sync()
+            if not updated:
                 self.progress_updated.emit(100)
 
             self.logger.info("模型加载完成")
             # 发出加载完成信号
             self.model_load_complete.emit()
+            self.start_prefetch(latest_version)
 
         except Exception as e:
             self.logger.error(f"模型加载错误: {str(e)}")
             raise e
+        finally:
+            self.is_foreground_loading = False
@@ -0,0 +1,679 @@
+import os
+import json
+import time
+import asyncio
+from threading import Thread, Event, Lock
+from utils.logger import get_logger
+from utils.config import get_config
+from utils.model_file import open_model_file
+from utils.model_cache import get_model_cache, LoadedModel
+from utils.inference_service import create_model
+from utils.model_gc import ModelGarbageCollector, lower_io_priority
+from utils.shared_cache import SharedModelCache, FileLock
+from utils.downloader import MirrorDownloader
+from utils.activity import get_activity_monitor
+
+
+class ModelSyncEngine:
+    """模型同步引擎，负责模型的版本检查、下载、激活、预取和清理
+
+    不依赖 Qt，界面由 ModelController 通过回调适配，
+    命令行（src/cli.py）可以在没有显示环境的机器上直接使用。
+    """
+
+    def __init__(
+        self, model_dir=None, utoken=None, on_progress=None, on_download_started=None
+    ):
+        """
+        Args:
+            model_dir: 模型目录，默认使用配置 [Model] model_dir
+            utoken: 可选的用户 token，下载时以 Authorization 请求头发送
+            on_progress: 可选的进度回调 on_progress(int)，参数为 0-100
+            on_download_started: 可选的无参回调，开始实际下载时调用
+        """
+        self.logger = get_logger()
+        self.config = get_config()
+        self.utoken = utoken
+        self.on_progress = on_progress
+        self.on_download_started = on_download_started
+
+        # 模型信息
+        self.model_dir = model_dir or self.config.get("Model", "model_dir", "models")
+        self.version_file = "version.json"  # 固定的版本文件名
+        self.history_file = "version_history.json"  # 已激活版本的历史记录
+        self.prefetch_file = "prefetch.json"  # 已预取但未激活的版本信息
+        self.current_model = None  # 当前模型信息，从版本文件中读取
+        self.model_cache = get_model_cache()  # 已构建模型的 LRU 缓存
+        self.is_update_in_progress = False  # 是否正在进行后台更新
+        self.is_prefetch_in_progress = False  # 是否正在预取下一个版本
+        self._prefetch_lock = Lock()  # 保护以下预取状态
+        self._prefetch_version = None  # 正在预取的版本号
+        self._prefetch_downloader = None  # 正在预取的下载器
+        self._prefetch_takeover = False  # 下载同一版本时接管预取：不再暂停和限速
+        self._prefetch_done = Event()  # 预取结束（成功或失败）时设置
+        self._prefetch_done.set()
+        self.is_gc_pending = False  # 垃圾回收因后台更新被跳过，等待更新结束后重试
+        self.use_shared_cache = True  # 是否使用配置的机器级共享缓存
+
+        # 确保模型目录存在
+        os.makedirs(self.model_dir, exist_ok=True)
+
+    def _get_request_headers(self):
+        """下载请求附加的请求头"""
+        if not self.utoken:
+            return {}
+        return {"Authorization": f"Bearer {self.utoken}"}
+
+    def _get_version_file_path(self):
+        """获取版本文件的完整路径"""
+        return os.path.join(self.model_dir, self.version_file)
+
+    def _get_history_file_path(self):
+        """获取版本历史文件的完整路径"""
+        return os.path.join(self.model_dir, self.history_file)
+
+    def _read_version_history(self):
+        """读取版本历史，按激活顺序排列，读取失败时返回空列表"""
+        try:
+            with open(self._get_history_file_path(), "r", encoding="utf-8") as f:
+                history = json.load(f)
+            return [info for info in history if "model_name" in info]
+        except FileNotFoundError:
+            return []
+        except (json.JSONDecodeError, IOError, TypeError) as e:
+            self.logger.error(f"读取版本历史错误: {str(e)}")
+            return []
+
+    def _save_version_history(self, history):
+        """原子保存版本历史"""
+        history_file = self._get_history_file_path()
+        tmp_file = f"{history_file}.tmp"
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(history, f, indent=4)
+            os.replace(tmp_file, history_file)
+        except IOError as e:
+            self.logger.error(f"保存版本历史错误: {str(e)}")
+
+    def _get_history_lock(self):
+        """版本历史的文件锁，读-改-写版本历史时持有，同一进程的多个线程和其他进程共用"""
+        return FileLock(os.path.join(self.model_dir, "version_history.lock"))
+
+    def _record_version_history(self, version_info):
+        """把新激活的版本追加到版本历史末尾"""
+        lock = self._get_history_lock()
+        lock.acquire()
+        try:
+            history = [
+                info
+                for info in self._read_version_history()
+                if info["model_name"] != version_info["model_name"]
+            ]
+            history.append(version_info)
+            self._save_version_history(history)
+        finally:
+            lock.release()
+
+    def _get_staging_file_path(self, version_info):
+        """获取模型下载暂存文件的路径，下载完成并激活后才会重命名为正式文件"""
+        return os.path.join(self.model_dir, f"{version_info['model_name']}.partial")
+
+    def _get_prefetch_staging_file_path(self, version_info):
+        """获取预取暂存文件的路径，与下载暂存文件分开，互不覆盖"""
+        return os.path.join(
+            self.model_dir, f"{version_info['model_name']}.prefetch.partial"
+        )
+
+    def _get_shared_cache_name(self, version_info):
+        """共享缓存中的文件名，包含版本号以区分不同版本"""
+        return f"{version_info['version']}_{version_info['model_name']}"
+
+    def get_model_file_path(self):
+        """获取模型文件的完整路径"""
+        if not self.current_model:
+            return None
+        return os.path.join(self.model_dir, self.current_model.get("model_name"))
+
+    def _get_cache_key(self, version_info):
+        """获取模型缓存的键"""
+        return (version_info["model_name"], version_info["version"])
+
+    def _build_model(self, backend, model_path, version_info):
+        """以只读内存映射打开模型文件并构建推理后端模型"""
+        model_file = open_model_file(model_path)
+        try:
+            model = create_model(backend, model_file, version_info)
+        except Exception:
+            model_file.close()
+            raise
+        return LoadedModel(model, model_file)
+
+    def load_model(self, version_info=None):
+        """通过模型缓存获取推理后端模型，默认加载当前版本
+
+        后端由配置 [Inference] backend 指定。缓存未命中时映射模型文件并构建模型，
+        命中时直接返回已构建的模型，切换回缓存中的版本不必重新构建。
+        返回的 PinnedModel 处于固定状态，不会被缓存淘汰，用完后调用其 close() 取消固定。
+        没有版本信息或模型文件不存在时构建不经缓存的模型，close() 直接关闭模型。
+        """
+        backend = self.config.get("Inference", "backend", "dummy")
+        version_info = version_info or self.current_model
+        model_path = (
+            os.path.join(self.model_dir, version_info["model_name"])
+            if version_info
+            else None
+        )
+        if not model_path or not os.path.exists(model_path):
+            if model_path:
+                self.logger.warning(f"模型文件不存在: {model_path}")
+            return create_model(backend, None, version_info)
+
+        model = self.model_cache.pin(
+            self._get_cache_key(version_info),
+            lambda: self._build_model(backend, model_path, version_info),
+        )
+        self.logger.debug(f"模型缓存统计: {self.model_cache.get_stats()}")
+        return model
+
+    def _verify_file(self, model_path, version_info):
+        """校验模型文件完整性
+
+        版本信息包含 sha256 时，在只读内存映射上计算哈希，不把模型读入内存
+        返回: bool - 校验是否通过，文件不存在或没有 sha256 时视为通过
+        """
+        expected = version_info.get("sha256")
+        if not expected or not os.path.exists(model_path):
+            return True
+        with open_model_file(model_path) as model_file:
+            return model_file.verify(expected)
+
+    def _get_file_stat(self, model_path):
+        """校验通过时模型文件的大小和修改时间，与 sha256 一起记录在版本信息中"""
+        stat = os.stat(model_path)
+        return {"verified_size": stat.st_size, "verified_mtime_ns": stat.st_mtime_ns}
+
+    def _is_unchanged(self, model_path, version_info):
+        """模型文件自上次校验通过后是否未被修改（大小和修改时间与记录一致）"""
+        if "verified_size" not in version_info:
+            return False
+        try:
+            stat = self._get_file_stat(model_path)
+        except OSError:
+            return False
+        return all(version_info.get(key) == value for key, value in stat.items())
+
+    def verify_model_file(self):
+        """校验当前版本的模型文件
+
+        文件大小和修改时间与上次校验通过时一致时不再计算哈希，
+        只有文件发生变化（或旧版本程序安装的模型没有记录）时才重新校验
+        返回: bool - 校验是否通过
+        """
+        model_path = self.get_model_file_path()
+        if not model_path or not os.path.exists(model_path):
+            self.logger.warning(f"模型文件不存在: {model_path}")
+            return True
+        if not self.current_model.get("sha256"):
+            return True
+        if self._is_unchanged(model_path, self.current_model):
+            self.logger.debug("模型文件自上次校验后未变化，跳过校验")
+            return True
+        if not self._verify_file(model_path, self.current_model):
+            self.logger.error(f"模型文件校验失败: {model_path}")
+            return False
+        self.logger.info("模型文件校验通过")
+        # 记录本次校验时的文件状态，下次启动不再重复计算哈希
+        self._save_version_info(
+            {**self.current_model, **self._get_file_stat(model_path)}
+        )
+        return True
+
+    def read_local_version(self):
+        """读取本地版本信息
+        返回: (bool, dict) - (是否成功, 版本信息)
+        """
+        version_file = self._get_version_file_path()
+        try:
+            if not os.path.exists(version_file):
+                self.logger.info("版本文件不存在")
+                return False, None
+
+            with open(version_file, "r", encoding="utf-8") as f:
+                version_info = json.load(f)
+
+            # 验证版本信息格式
+            required_fields = ["version", "model_name", "timestamp"]
+            if not all(field in version_info for field in required_fields):
+                self.logger.error("版本文件格式错误")
+                return False, None
+
+            # 更新当前模型信息
+            self.current_model = version_info
+            return True, version_info
+
+        except (json.JSONDecodeError, IOError) as e:
+            self.logger.error(f"读取版本文件错误: {str(e)}")
+            return False, None
+
+    def _save_version_info(self, version_info):
+        """保存版本信息到文件
+
+        先写入临时文件再原子替换 version.json，其他进程不会读到写了一半的版本文件
+        """
+        version_file = self._get_version_file_path()
+        tmp_file = f"{version_file}.tmp"
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(version_info, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, version_file)
+            # 更新当前模型信息
+            self.current_model = version_info
+            return True
+        except IOError as e:
+            self.logger.error(f"保存版本文件错误: {str(e)}")
+            return False
+
+    async def check_version(self):
+        """检查模型版本
+        返回: (bool, dict) - (是否需要更新, 最新版本信息)
+        """
+        self.logger.info("正在检查模型版本...")
+
+        # 读取本地版本信息
+        local_success, local_version = self.read_local_version()
+
+        # TODO: 实现实际的版本检查逻辑
+        # 1. 向服务器发送请求，获取最新版本信息
+        # 示例 API:
+        # GET /api/model/version
+        # Headers: self._get_request_headers()
+        await asyncio.sleep(1)  # 模拟网络请求
+
+        # 模拟服务器返回的新版本信息
+        server_version = {
+            "version": "1.0.0",
+            "model_name": "model_1201.pt",
+            "timestamp": "2023-12-01T12:00:00Z",
+        }
+
+        # 如果本地版本读取失败，需要更新
+        if not local_success:
+            return True, server_version
+
+        # 比较版本
+        return server_version["version"] != local_version["version"], server_version
+
+    async def download(self, version_info):
+        """下载模型到暂存文件，完成后激活新版本
+
+        同一版本正在后台预取时接管预取（取消暂停和限速）并等待其完成，不重复下载
+        """
+        loop = asyncio.get_running_loop()
+        if self._prefetch_version == version_info["version"]:
+            if self.on_download_started:
+                self.on_download_started()
+            await loop.run_in_executor(None, self._take_over_prefetch, version_info)
+
+        if self._is_prefetched(version_info):
+            self.logger.info(f"模型版本 {version_info['version']} 已预取，直接激活")
+            self._activate_version(version_info)
+            return
+
+        self.logger.info("开始下载模型...")
+        if self.on_download_started:
+            self.on_download_started()
+        staging_path = self._get_staging_file_path(version_info)
+
+        shared_cache = None
+        if self._get_mirror_urls(version_info):
+            # 只有实际传输时才经过共享缓存，模拟下载不会生成文件
+            shared_cache = self._get_shared_cache()
+        if shared_cache:
+            # 同一台机器上只有一个进程下载，其他进程跟随进度并链接同一文件
+            await loop.run_in_executor(
+                None,
+                shared_cache.fetch_into,
+                self._get_shared_cache_name(version_info),
+                staging_path,
+                lambda dest_path, report: self._fetch_verified_model_file(
+                    version_info, dest_path, report
+                ),
+                self._report_download_progress,
+            )
+        else:
+            await loop.run_in_executor(
+                None,
+                self._fetch_verified_model_file,
+                version_info,
+                staging_path,
+                self._report_download_progress,
+            )
+
+        # 暂存文件已校验通过，激活新版本
+        self._activate_version(version_info)
+
+    async def sync(self):
+        """检查版本，需要时下载并激活新版本
+
+        版本已是最新但模型文件校验失败时重新下载
+        返回: (bool, dict) - (是否安装了新版本, 最新版本信息)
+        """
+        need_update, latest_version = await self.check_version()
+        if not need_update and not self.verify_model_file():
+            self.logger.warning("本地模型文件已损坏，重新下载")
+            need_update = True
+        if need_update:
+            self.logger.info("模型需要更新")
+            await self.download(latest_version)
+        else:
+            self.logger.info("模型已是最新版本")
+        return need_update, latest_version
+
+    def _get_shared_cache(self):
+        """获取机器级共享模型缓存，未配置或不使用时返回 None"""
+        shared_dir = self.config.get("Model", "shared_cache_dir", "")
+        if not shared_dir or not self.use_shared_cache:
+            return None
+        return SharedModelCache(shared_dir)
+
+    def _report_download_progress(self, value):
+        """报告下载进度"""
+        if self.on_progress:
+            self.on_progress(value)
+        self.logger.info(f"下载进度：{value}%")
+
+    def _get_mirror_urls(self, version_info):
+        """获取模型文件的镜像 URL 列表
+
+        优先使用版本清单中的 mirrors，没有时使用配置 [Download] mirrors（逗号分隔）
+        """
+        mirrors = version_info.get("mirrors") or [
+            url.strip()
+            for url in self.config.get("Download", "mirrors", "").split(",")
+            if url.strip()
+        ]
+        return [f"{url.rstrip('/')}/{version_info['model_name']}" for url in mirrors]
+
+    def _fetch_verified_model_file(self, version_info, dest_path, report_progress):
+        """下载模型文件到 dest_path 并校验，在线程池中执行
+
+        这是激活前唯一的一次完整哈希；经过共享缓存时在放入缓存前校验，
+        校验失败的文件会被删除，不会激活也不会进入共享缓存
+        """
+        self._fetch_model_file(version_info, dest_path, report_progress)
+        if not self._verify_file(dest_path, version_info):
+            os.remove(dest_path)
+            raise Exception(f"下载的模型文件校验失败: {dest_path}")
+
+    def _fetch_model_file(self, version_info, dest_path, report_progress):
+        """下载模型文件到 dest_path，在线程池中执行"""
+        mirror_urls = self._get_mirror_urls(version_info)
+        if mirror_urls:
+            downloader = MirrorDownloader(
+                mirror_urls,
+                segment_size=self.config.getint(
+                    "Download", "segment_size", 8 * 1024 * 1024
+                ),
+                max_parallel=self.config.getint("Download", "max_parallel", 4),
+                stall_timeout=self.config.getfloat("Download", "stall_timeout", 10.0),
+                headers=self._get_request_headers(),
+            )
+            # 由 _fetch_verified_model_file 统一校验，这里不重复计算哈希
+            downloader.download(dest_path, report_progress)
+            self.logger.debug(f"镜像下载统计: {downloader.get_mirror_stats()}")
+            return
+
+        # TODO: 服务器版本清单提供镜像列表后移除模拟下载
+        # 模拟下载进度
+        for i in range(0, 101, 10):
+            time.sleep(1)
+            report_progress(i)
+
+    def _activate_version(self, version_info):
+        """激活已暂存的新版本
+
+        先把暂存文件原子重命名为正式模型文件，再原子替换 version.json。
+        version.json 的替换是切换点：替换前读取到的都是旧版本，替换后都是新版本。
+        旧版本的模型文件保留在模型目录中，已映射旧文件的进程不受影响。
+        激活的文件都已校验通过，版本信息中同时记录文件的大小和修改时间，
+        之后文件未变化时不再重新计算哈希。
+        """
+        model_path = os.path.join(self.model_dir, version_info["model_name"])
+        staging_path = self._get_staging_file_path(version_info)
+        if os.path.exists(staging_path):
+            os.replace(staging_path, model_path)
+        if version_info.get("sha256") and os.path.exists(model_path):
+            version_info = {**version_info, **self._get_file_stat(model_path)}
+
+        # 保存版本信息
+        if self._save_version_info(version_info):
+            self.logger.info(f"模型版本 {version_info['version']} 已激活: {model_path}")
+        else:
+            raise Exception("保存版本信息失败")
+        self._record_version_history(version_info)
+
+        # 已激活的版本不再需要预取记录
+        prefetched = self._read_prefetch_record()
+        if prefetched and prefetched.get("version") == version_info["version"]:
+            os.remove(self._get_prefetch_file_path())
+
+    def _get_prefetch_file_path(self):
+        """获取预取记录文件的完整路径"""
+        return os.path.join(self.model_dir, self.prefetch_file)
+
+    def _read_prefetch_record(self):
+        """读取预取记录，没有记录时返回 None"""
+        try:
+            with open(self._get_prefetch_file_path(), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, IOError):
+            return None
+
+    def _is_prefetched(self, version_info):
+        """该版本是否已完整预取到模型目录"""
+        prefetched = self._read_prefetch_record()
+        if not prefetched:
+            return False
+        for field in ("version", "model_name"):
+            if prefetched.get(field) != version_info[field]:
+                return False
+
+        model_path = os.path.join(self.model_dir, version_info["model_name"])
+        if not os.path.exists(model_path):
+            return False
+        if version_info.get("sha256") and not self._is_unchanged(
+            model_path, prefetched
+        ):
+            # 预取完成时已校验并记录文件状态，文件被修改过时视为未预取
+            self.logger.warning(f"预取的模型文件已被修改: {model_path}")
+            return False
+        return True
+
+    def start_prefetch(self, version_info):
+        """版本清单预告了下一个版本（next 字段）时，在后台低优先级预取
+
+        预取限速进行，用户活动时暂停；下载完成后只放入模型目录，不激活，
+        下次加载或后台更新到该版本时直接激活，无需再显示加载窗口。
+        配置了共享缓存时经过共享缓存，同一台机器上只预取一次
+        """
+        next_info = version_info.get("next") if version_info else None
+        if not next_info or not self.config.getboolean("Prefetch", "enabled", True):
+            return
+        if self.is_prefetch_in_progress or self._is_prefetched(next_info):
+            return
+        if self.current_model and (
+            next_info["model_name"] == self.current_model["model_name"]
+        ):
+            # 与当前模型文件同名时预取会覆盖正在使用的文件
+            self.logger.warning("下一个版本与当前模型文件同名，跳过预取")
+            return
+        self.is_prefetch_in_progress = True
+        with self._prefetch_lock:
+            self._prefetch_version = next_info["version"]
+            self._prefetch_done.clear()
+        prefetch_thread = Thread(target=self.run_prefetch, args=(next_info,))
+        prefetch_thread.daemon = True
+        prefetch_thread.start()
+
+    def run_prefetch(self, next_info, idle_seconds=None):
+        """以低优先级预取下一个版本，在调用线程中执行
+
+        Args:
+            next_info: 下一个版本的版本信息
+            idle_seconds: 用户空闲多少秒后才传输，默认使用配置 [Prefetch] idle_seconds，
+                          0 表示不等待用户空闲（无界面运行时）
+        返回: bool - 是否预取成功
+        """
+        lower_io_priority()
+        self.is_prefetch_in_progress = True
+        with self._prefetch_lock:
+            self._prefetch_version = next_info["version"]
+            self._prefetch_done.clear()
+        staging_path = self._get_prefetch_staging_file_path(next_info)
+        try:
+            mirror_urls = self._get_mirror_urls(next_info)
+            if not mirror_urls:
+                self.logger.info("没有可用的下载镜像，跳过预取")
+                return False
+
+            monitor = get_activity_monitor()
+            if idle_seconds is None:
+                idle_seconds = self.config.getint("Prefetch", "idle_seconds", 60)
+            downloader = MirrorDownloader(
+                mirror_urls,
+                max_parallel=1,
+                rate_limit=self.config.getint("Prefetch", "bandwidth_limit", 1048576),
+                should_pause=lambda: not self._prefetch_takeover
+                and (self.is_update_in_progress or not monitor.is_idle(idle_seconds)),
+                stall_timeout=self.config.getfloat("Download", "stall_timeout", 10.0),
+                headers=self._get_request_headers(),
+            )
+            with self._prefetch_lock:
+                self._prefetch_downloader = downloader
+                if self._prefetch_takeover:
+                    downloader.rate_limit = 0
+
+            def fetch(dest_path, report):
+                def progress(value):
+                    if report:
+                        report(value)
+                    # 被前台下载接管后，进度转给加载窗口
+                    if self._prefetch_takeover:
+                        self._report_download_progress(value)
+
+                downloader.download(dest_path, progress)
+                if not self._verify_file(dest_path, next_info):
+                    os.remove(dest_path)
+                    raise Exception(f"预取的模型文件校验失败: {dest_path}")
+
+            self.logger.info(f"开始预取模型版本 {next_info['version']}")
+            shared_cache = self._get_shared_cache()
+            if shared_cache:
+                shared_cache.fetch_into(
+                    self._get_shared_cache_name(next_info), staging_path, fetch
+                )
+            else:
+                fetch(staging_path, None)
+
+            _, active_info = self.read_local_version()
+            if active_info and active_info["version"] == next_info["version"]:
+                # 预取期间该版本已由其他途径下载并激活，不覆盖正在使用的文件
+                os.remove(staging_path)
+                return True
+            model_path = os.path.join(self.model_dir, next_info["model_name"])
+            os.replace(staging_path, model_path)
+            prefetch_file = self._get_prefetch_file_path()
+            with open(f"{prefetch_file}.tmp", "w", encoding="utf-8") as f:
+                json.dump({**next_info, **self._get_file_stat(model_path)}, f, indent=4)
+            os.replace(f"{prefetch_file}.tmp", prefetch_file)
+            self.logger.info(f"模型版本 {next_info['version']} 预取完成")
+            return True
+        except Exception as e:
+            self.logger.error(f"预取模型错误: {str(e)}")
+            if os.path.exists(staging_path):
+                os.remove(staging_path)
+            return False
+        finally:
+            self.is_prefetch_in_progress = False
+            with self._prefetch_lock:
+                self._prefetch_version = None
+                self._prefetch_downloader = None
+                self._prefetch_takeover = False
+                self._prefetch_done.set()
+
+    def _take_over_prefetch(self, version_info):
+        """前台下载的版本正在预取时接管预取，取消暂停和限速并等待预取结束，在线程池中执行"""
+        with self._prefetch_lock:
+            if self._prefetch_version != version_info["version"]:
+                return
+            self.logger.info(f"模型版本 {version_info['version']} 正在预取，接管预取")
+            self._prefetch_takeover = True
+            if self._prefetch_downloader is not None:
+                self._prefetch_downloader.rate_limit = 0
+        self._prefetch_done.wait()
+
+    def start_garbage_collection(self):
+        """在低优先级后台线程中清理旧版本模型文件"""
+        if not self.config.getboolean("ModelGC", "enabled", True):
+            return
+        gc_thread = Thread(target=self.run_garbage_collection)
+        gc_thread.daemon = True
+        gc_thread.start()
+
+    def _with_active_version(self, history, active_info):
+        """旧版本程序安装的模型没有历史记录，补记当前版本"""
+        if active_info and not any(
+            info["model_name"] == active_info["model_name"] for info in history
+        ):
+            history.append(active_info)
+        return history
+
+    def run_garbage_collection(self):
+        """清理旧版本模型文件，在调用线程中执行
+        返回: int - 释放的字节数，跳过或失败时返回 None
+        """
+        lower_io_priority()
+        if self.is_update_in_progress:
+            self.logger.info("后台更新进行中，跳过本次模型垃圾回收，更新结束后重试")
+            self.is_gc_pending = True
+            return None
+        try:
+            collector = ModelGarbageCollector(
+                self.model_dir,
+                keep_versions=self.config.getint("ModelGC", "keep_versions", 2),
+                quota_bytes=self.config.getint("ModelGC", "quota_bytes", 0),
+                partial_max_age=self.config.getint(
+                    "ModelGC", "partial_max_age", 24 * 3600
+                ),
+            )
+            _, active_info = self.read_local_version()
+            history = self._with_active_version(
+                self._read_version_history(), active_info
+            )
+            remaining, freed = collector.collect(active_info, history)
+
+            # 回收期间其他线程或进程可能激活了新版本，重新读取历史后只去掉已删除的版本
+            removed_names = {info["model_name"] for info in history} - {
+                info["model_name"] for info in remaining
+            }
+            lock = self._get_history_lock()
+            lock.acquire()
+            try:
+                current = self._with_active_version(
+                    self._read_version_history(), active_info
+                )
+                self._save_version_history(
+                    [
+                        info
+                        for info in current
+                        if info["model_name"] not in removed_names
+                    ]
+                )
+            finally:
+                lock.release()
+            return freed
+        except Exception as e:
+            self.logger.error(f"模型垃圾回收错误: {str(e)}")
+            return None
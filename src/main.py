@@ -1,16 +1,38 @@
+import os
 import sys
+import argparse
 from PyQt5.QtWidgets import QApplication
 from controllers.login_controller import LoginController
+from utils.theme import get_theme
+
+
+def parse_args():
+    """解析命令行参数，未识别的参数留给 Qt"""
+    parser = argparse.ArgumentParser(description="CTC-AI 桌面客户端")
+    parser.add_argument(
+        "--utoken",
+        default=os.environ.get("CTC_UTOKEN"),
+        help="直接使用该 token 登录，跳过浏览器登录（默认读取环境变量 CTC_UTOKEN）",
+    )
+    return parser.parse_known_args()
 
 
 def main():
     """程序入口点"""
-    app = QApplication(sys.argv)
+    args, qt_args = parse_args()
+    app = QApplication(sys.argv[:1] + qt_args)
+
+    # 一次性编译并加载应用级主题
+    get_theme().apply(app)
 
     # 创建登录控制器并显示登录窗口
     login_controller = LoginController()
     login_controller.show_login_window()
 
+    # 注入的 token 直接走登录成功流程
+    if args.utoken:
+        login_controller.handle_login_success(args.utoken)
+
     sys.exit(app.exec_())
 
 
@@ -0,0 +1,44 @@
+import time
+import threading
+
+
+class ActivityMonitor:
+    """用户活动监视器
+
+    界面输入事件和用户发起的推理请求会调用 notify()，
+    后台任务（如模型预取）据此判断用户是否空闲。
+    """
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not ActivityMonitor._initialized:
+            ActivityMonitor._initialized = True
+            self._lock = threading.Lock()
+            self._last_activity = time.monotonic()
+
+    def notify(self):
+        """记录一次用户活动"""
+        with self._lock:
+            self._last_activity = time.monotonic()
+
+    def seconds_since_activity(self):
+        """距离最近一次用户活动的秒数"""
+        with self._lock:
+            return time.monotonic() - self._last_activity
+
+    def is_idle(self, idle_seconds):
+        """用户是否已空闲超过 idle_seconds 秒"""
+        return self.seconds_since_activity() >= idle_seconds
+
+
+# 全局函数获取活动监视器实例
+def get_activity_monitor() -> ActivityMonitor:
+    """获取全局活动监视器实例"""
+    return ActivityMonitor()
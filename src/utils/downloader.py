@@ -0,0 +1,345 @@
+import time
+import hashlib
+import threading
+import urllib.request
+import urllib.error
+from .logger import get_logger
+
+
+class DownloadError(Exception):
+    """下载失败"""
+
+
+class MirrorStats:
+    """镜像的测速结果和运行状态"""
+
+    def __init__(self, url):
+        self.url = url
+        self.latency = None  # 首字节延迟（秒）
+        self.throughput = 0.0  # 测速吞吐量（字节/秒）
+        self.failures = 0
+        self.supports_range = False
+
+    @property
+    def available(self):
+        return self.latency is not None
+
+    def __repr__(self):
+        return (
+            f"<Mirror {self.url} latency={self.latency} "
+            f"throughput={self.throughput:.0f} failures={self.failures}>"
+        )
+
+
+class _Segment:
+    """待下载的文件区间 [start, end)，offset 为已写入的位置"""
+
+    __slots__ = ("start", "end", "offset")
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+        self.offset = start
+
+
+class MirrorDownloader:
+    """多镜像分段下载器
+
+    开始时对每个镜像做一次区间请求测速，按吞吐量排序；
+    文件被切成多个分段，由多个线程从最快的几个镜像并行下载。
+    某个镜像在传输中途停滞（超过 stall_timeout 没有数据）或出错时，
+    该分段从已写入的位置起转给下一个镜像继续下载，失败过多的镜像不再使用。
+    """
+
+    def __init__(
+        self,
+        mirrors,
+        segment_size=8 * 1024 * 1024,
+        max_parallel=4,
+        probe_bytes=256 * 1024,
+        stall_timeout=10.0,
+        chunk_size=64 * 1024,
+        max_failures=3,
+        min_relative_speed=0.25,
+        rate_limit=0,
+        should_pause=None,
+        headers=None,
+    ):
+        """
+        Args:
+            mirrors: 文件的完整 URL 列表，每个镜像一个
+            segment_size: 分段大小（字节）
+            max_parallel: 并行下载的最大线程数
+            probe_bytes: 测速时请求的字节数
+            stall_timeout: 读取停滞超时（秒）
+            chunk_size: 每次读取的字节数
+            max_failures: 镜像失败达到该次数后不再使用
+            min_relative_speed: 测速吞吐低于最快镜像该比例的镜像只作为备用
+            rate_limit: 所有线程合计的带宽上限（字节/秒），0 表示不限速
+            should_pause: 可选的无参可调用对象，返回 True 时暂停传输
+            headers: 附加的请求头
+        """
+        self.logger = get_logger()
+        self.mirrors = [MirrorStats(url) for url in mirrors]
+        self.segment_size = segment_size
+        self.max_parallel = max(1, max_parallel)
+        self.probe_bytes = probe_bytes
+        self.stall_timeout = stall_timeout
+        self.chunk_size = chunk_size
+        self.max_failures = max_failures
+        self.min_relative_speed = min_relative_speed
+        self.rate_limit = rate_limit
+        self.should_pause = should_pause
+        self.headers = dict(headers or {})
+
+        self._lock = threading.Lock()
+        self._downloaded = 0
+        self._total_size = None
+        self._next_send_time = 0.0
+
+    def _open(self, url, start=None, end=None):
+        """发起请求，start/end 指定区间 [start, end)"""
+        request = urllib.request.Request(url, headers=self.headers)
+        if start is not None:
+            range_end = "" if end is None else end - 1
+            request.add_header("Range", f"bytes={start}-{range_end}")
+        return urllib.request.urlopen(request, timeout=self.stall_timeout)
+
+    def _probe_mirror(self, mirror):
+        """对单个镜像测速，同时获取文件大小"""
+        try:
+            start_time = time.perf_counter()
+            with self._open(mirror.url, 0, self.probe_bytes) as response:
+                first = response.read(1)
+                mirror.latency = time.perf_counter() - start_time
+                received = len(first)
+                while received < self.probe_bytes:
+                    data = response.read(self.chunk_size)
+                    if not data:
+                        break
+                    received += len(data)
+                elapsed = time.perf_counter() - start_time
+                mirror.throughput = received / elapsed if elapsed > 0 else 0.0
+
+                content_range = response.headers.get("Content-Range")
+                if response.status == 206 and content_range:
+                    mirror.supports_range = True
+                    total = content_range.rsplit("/", 1)[-1]
+                    if total.isdigit():
+                        return int(total)
+                length = response.headers.get("Content-Length")
+                if response.status == 200 and length and length.isdigit():
+                    return int(length)
+        except (urllib.error.URLError, OSError) as e:
+            self.logger.warning(f"镜像测速失败: {mirror.url} ({str(e)})")
+            mirror.latency = None
+        return None
+
+    def probe(self):
+        """并行测速所有镜像，返回按速度排序的可用镜像和文件大小"""
+        sizes = {}
+        threads = []
+        for mirror in self.mirrors:
+            thread = threading.Thread(
+                target=lambda m=mirror: sizes.__setitem__(
+                    m.url, self._probe_mirror(m)
+                ),
+                daemon=True,
+            )
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+
+        ranked = sorted(
+            (m for m in self.mirrors if m.available),
+            key=lambda m: (-m.throughput, m.latency),
+        )
+        for mirror in ranked:
+            self.logger.info(
+                f"镜像 {mirror.url}: 延迟 {mirror.latency * 1000:.0f}ms，"
+                f"吞吐 {mirror.throughput / 1024:.0f}KB/s"
+            )
+        known_sizes = [size for size in sizes.values() if size]
+        # 以多数镜像报告的大小为准
+        total_size = None
+        if known_sizes:
+            total_size = max(set(known_sizes), key=known_sizes.count)
+        return ranked, total_size
+
+    def _pick_mirror(self, ranked, preferred_index, exclude=None):
+        """选择镜像：优先使用 preferred_index 对应的镜像，不可用时按速度顺序选下一个"""
+        with self._lock:
+            usable = [
+                m
+                for m in ranked
+                if m.failures < self.max_failures
+                and m.supports_range
+                and m is not exclude
+            ]
+            # 没有其他镜像时，允许重试失败次数未超限的当前镜像
+            if (
+                not usable
+                and exclude is not None
+                and exclude.failures < self.max_failures
+            ):
+                usable = [exclude]
+        if not usable:
+            return None
+        # 优先在速度接近最快镜像的镜像之间分配，慢镜像只在快镜像都不可用时使用
+        threshold = usable[0].throughput * self.min_relative_speed
+        fast = [m for m in usable if m.throughput >= threshold]
+        return fast[preferred_index % len(fast)]
+
+    def _throttle(self, size):
+        """按带宽上限和暂停条件控制传输节奏"""
+        while self.should_pause and self.should_pause():
+            time.sleep(0.5)
+        if not self.rate_limit:
+            return
+        with self._lock:
+            now = time.perf_counter()
+            send_time = max(now, self._next_send_time)
+            self._next_send_time = send_time + size / self.rate_limit
+        if send_time > now:
+            time.sleep(send_time - now)
+
+    def _add_progress(self, size, report_progress):
+        """累计下载字节数并报告进度"""
+        with self._lock:
+            before = self._downloaded * 100 // self._total_size
+            self._downloaded += size
+            after = self._downloaded * 100 // self._total_size
+        if report_progress and after != before:
+            report_progress(min(after, 100))
+
+    def _download_segment(self, mirror, segment, dest_path, report_progress):
+        """从镜像下载分段剩余部分，出错时抛出异常，segment.offset 保留已写入位置"""
+        with self._open(mirror.url, segment.offset, segment.end) as response:
+            if response.status != 206:
+                raise DownloadError(f"镜像不支持区间请求: {mirror.url}")
+            with open(dest_path, "r+b") as f:
+                f.seek(segment.offset)
+                while segment.offset < segment.end:
+                    want = min(self.chunk_size, segment.end - segment.offset)
+                    self._throttle(want)
+                    data = response.read(want)
+                    if not data:
+                        raise DownloadError(f"镜像提前结束传输: {mirror.url}")
+                    f.write(data)
+                    segment.offset += len(data)
+                    self._add_progress(len(data), report_progress)
+
+    def _worker(
+        self, worker_index, ranked, segments, dest_path, report_progress, errors
+    ):
+        """下载线程：从队列中取分段下载，失败时换镜像重试"""
+        while True:
+            with self._lock:
+                if not segments or errors:
+                    return
+                segment = segments.pop(0)
+
+            mirror = self._pick_mirror(ranked, worker_index)
+            while segment.offset < segment.end:
+                if mirror is None:
+                    with self._lock:
+                        errors.append(DownloadError("所有镜像均不可用"))
+                    return
+                try:
+                    self._download_segment(
+                        mirror, segment, dest_path, report_progress
+                    )
+                except (urllib.error.URLError, OSError, DownloadError) as e:
+                    with self._lock:
+                        mirror.failures += 1
+                    self.logger.warning(
+                        f"镜像 {mirror.url} 下载分段 {segment.start}-{segment.end} "
+                        f"中断于 {segment.offset}，切换镜像 ({str(e)})"
+                    )
+                    mirror = self._pick_mirror(ranked, worker_index, exclude=mirror)
+
+    def _download_single(self, ranked, dest_path, report_progress):
+        """镜像不支持区间请求时，按速度顺序逐个镜像整体下载"""
+        for mirror in ranked:
+            try:
+                with self._open(mirror.url) as response, open(dest_path, "wb") as f:
+                    with self._lock:
+                        self._downloaded = 0
+                    while True:
+                        self._throttle(self.chunk_size)
+                        data = response.read(self.chunk_size)
+                        if not data:
+                            break
+                        f.write(data)
+                        if self._total_size:
+                            self._add_progress(len(data), report_progress)
+                return
+            except (urllib.error.URLError, OSError) as e:
+                self.logger.warning(f"镜像 {mirror.url} 下载失败 ({str(e)})")
+        raise DownloadError("所有镜像均下载失败")
+
+    def download(self, dest_path, report_progress=None, expected_sha256=None):
+        """下载文件到 dest_path
+
+        Args:
+            dest_path: 目标文件路径
+            report_progress: 可选的进度回调 report_progress(int)，参数为 0-100
+            expected_sha256: 可选的 SHA-256，下载完成后校验
+        """
+        ranked, total_size = self.probe()
+        if not ranked:
+            raise DownloadError("没有可用的下载镜像")
+        self._total_size = total_size
+        self._downloaded = 0
+
+        if total_size and any(m.supports_range for m in ranked):
+            with open(dest_path, "wb") as f:
+                f.truncate(total_size)
+            segments = [
+                _Segment(start, min(start + self.segment_size, total_size))
+                for start in range(0, total_size, self.segment_size)
+            ]
+            errors = []
+            workers = [
+                threading.Thread(
+                    target=self._worker,
+                    args=(i, ranked, segments, dest_path, report_progress, errors),
+                    daemon=True,
+                )
+                for i in range(min(self.max_parallel, len(segments)))
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            if errors:
+                raise errors[0]
+        else:
+            self._download_single(ranked, dest_path, report_progress)
+
+        if report_progress and not total_size:
+            report_progress(100)
+        if expected_sha256 and not self._verify(dest_path, expected_sha256):
+            raise DownloadError(f"下载文件校验失败: {dest_path}")
+        self.logger.info(f"下载完成: {dest_path}")
+
+    def _verify(self, path, expected_sha256, chunk_size=4 * 1024 * 1024):
+        """校验下载文件的 SHA-256"""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest() == expected_sha256.lower()
+
+    def get_mirror_stats(self):
+        """获取各镜像的测速结果和失败次数"""
+        return [
+            {
+                "url": m.url,
+                "latency_ms": m.latency * 1000 if m.latency is not None else None,
+                "throughput": m.throughput,
+                "failures": m.failures,
+            }
+            for m in self.mirrors
+        ]
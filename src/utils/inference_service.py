@@ -0,0 +1,354 @@
+import time
+import queue
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from .logger import get_logger
+from .result_cache import input_digest
+
+
+class DummyModel:
+    """仅使用 CPU 的示例模型，用于测试和基准测试
+
+    每个批次有固定开销加上按条目计算的开销，模拟批处理带来的吞吐提升。
+    """
+
+    def __init__(self, batch_overhead_ms=2.0, per_item_ms=0.2):
+        self.batch_overhead_ms = batch_overhead_ms
+        self.per_item_ms = per_item_ms
+
+    def predict_batch(self, inputs):
+        """批量推理，返回与输入一一对应的结果列表"""
+        time.sleep((self.batch_overhead_ms + self.per_item_ms * len(inputs)) / 1000)
+        results = []
+        for data in inputs:
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            results.append(
+                {"size": len(data), "digest": hashlib.sha256(data).hexdigest()[:16]}
+            )
+        return results
+
+    def close(self):
+        """释放模型资源"""
+
+
+# 推理后端注册表：名称 -> factory(model_file, version_info)
+_backends = {
+    "dummy": lambda model_file, version_info: DummyModel(),
+}
+
+
+def register_backend(name, factory):
+    """注册推理后端
+
+    Args:
+        name: 后端名称，对应配置 [Inference] backend
+        factory: 可调用对象 factory(model_file, version_info)，
+                 返回提供 predict_batch(inputs) 方法的模型对象。
+                 model_file 为只读内存映射的 MappedModelFile（文件不存在时为 None），
+                 后端应通过 model_file.view() 获取零拷贝切片，不要复制整个文件。
+                 模型对象可通过 memory_bytes 属性报告自己分配的内存，供模型缓存计算预算
+    """
+    _backends[name] = factory
+
+
+def create_model(backend, model_file=None, version_info=None):
+    """按后端名称创建模型"""
+    if backend not in _backends:
+        raise ValueError(f"未知的推理后端: {backend}")
+    return _backends[backend](model_file, version_info)
+
+
+class _Request:
+    """排队中的推理请求"""
+
+    __slots__ = ("data", "digest", "future", "enqueued_at")
+
+    def __init__(self, data, digest=None):
+        self.data = data
+        self.digest = digest
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class InferenceService:
+    """推理服务，在后台线程中持有模型并对并发请求做动态微批处理
+
+    请求通过 submit() 提交并立即返回 Future。批处理线程以第一个请求的入队时间
+    加上 max_latency_ms 作为截止时间，在截止前尽量凑满 max_batch_size 个请求，
+    然后交给工作线程池执行。工作线程全忙时批次会继续积累，直到有线程空闲。
+    配置了结果缓存时，命中内存层的请求直接返回已完成的 Future，不会进入模型；
+    磁盘层在工作线程中、执行批次之前查找，不会阻塞提交请求的线程（通常是界面线程）。
+
+    swap_model() 可在运行中切换模型：之后分派的批次都使用新模型，
+    已在执行的批次继续使用旧模型，旧模型空闲后才被关闭。
+    """
+
+    def __init__(
+        self,
+        model_factory,
+        max_batch_size=8,
+        max_latency_ms=5.0,
+        num_workers=1,
+        result_cache=None,
+        model_version=None,
+    ):
+        """
+        Args:
+            model_factory: 无参可调用对象，在后台线程中创建模型
+            max_batch_size: 单个批次的最大请求数
+            max_latency_ms: 请求等待凑批的最长时间（毫秒）
+            num_workers: 执行批次的工作线程数
+            result_cache: 可选的 ResultCache，缓存推理结果
+            model_version: 模型版本，用于标记缓存结果所属的版本
+        """
+        self.logger = get_logger()
+        self.model_factory = model_factory
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_latency = max_latency_ms / 1000
+        self.num_workers = max(1, num_workers)
+        self.result_cache = result_cache
+
+        self._queue = queue.Queue()
+        self._stop_event = threading.Event()
+        self._worker_slots = threading.Semaphore(self.num_workers)
+        self._ready_event = threading.Event()
+        self._executor = None
+        self._batch_thread = None
+        self._model = None
+        self._model_version = model_version
+        self._model_lock = threading.Lock()
+        self._inflight = {}  # id(model) -> 执行中的批次数
+        self._retiring = {}  # id(model) -> (model, on_retired)，等待空闲后关闭
+        self._start_error = None
+
+        # 统计信息
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+
+    def start(self, wait=True):
+        """启动批处理线程，wait 为 True 时等待模型创建完成"""
+        if self._batch_thread is not None:
+            return
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.num_workers, thread_name_prefix="inference"
+        )
+        self._batch_thread = threading.Thread(
+            target=self._batch_loop, name="inference-batcher", daemon=True
+        )
+        self._batch_thread.start()
+        if wait:
+            self._ready_event.wait()
+            if self._start_error is not None:
+                raise self._start_error
+
+    def submit(self, data):
+        """提交推理请求，返回 concurrent.futures.Future
+
+        模型创建失败后提交的请求返回带有该异常的 Future
+        """
+        if self._start_error is not None:
+            return self._failed_future(self._start_error)
+        if self._batch_thread is None or self._stop_event.is_set():
+            raise RuntimeError("推理服务未启动")
+
+        digest = None
+        if self.result_cache is not None:
+            digest = input_digest(data)
+            found, result = self.result_cache.get(digest, memory_only=True)
+            if found:
+                future = Future()
+                future.set_result(result)
+                return future
+
+        request = _Request(data, digest)
+        self._queue.put(request)
+        if self._start_error is not None:
+            # 模型创建在入队前后失败，批处理线程已退出，由这里让请求失败
+            self._fail_pending(self._start_error)
+        return request.future
+
+    def _failed_future(self, error):
+        """返回带有异常的已完成 Future"""
+        future = Future()
+        future.set_exception(error)
+        return future
+
+    def _fail_pending(self, error):
+        """让队列中尚未处理的请求全部以 error 失败"""
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if request is not None and not request.future.done():
+                request.future.set_exception(error)
+
+    def _collect_batch(self, first):
+        """从队列中收集请求，直到批次已满或到达截止时间"""
+        batch = [first]
+        deadline = first.enqueued_at + self.max_latency
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining <= 0:
+                    request = self._queue.get_nowait()
+                else:
+                    request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                # 停止信号放回队列，当前批次处理完后退出
+                self._queue.put(None)
+                break
+            batch.append(request)
+        return batch
+
+    def _batch_loop(self):
+        """批处理线程主循环"""
+        try:
+            self._model = self.model_factory()
+            self.logger.info("推理模型已加载")
+        except Exception as e:
+            self.logger.error(f"推理模型加载错误: {str(e)}")
+            self._start_error = e
+            self._stop_event.set()
+            self._ready_event.set()
+            # 模型加载期间排队的请求不会再被处理
+            self._fail_pending(e)
+            return
+        self._ready_event.set()
+
+        while True:
+            first = self._queue.get()
+            if first is None:
+                break
+            # 等待空闲的工作线程，等待期间新请求继续进入队列，使批次更大
+            self._worker_slots.acquire()
+            batch = self._collect_batch(first)
+            with self._model_lock:
+                model, version = self._model, self._model_version
+                self._inflight[id(model)] = self._inflight.get(id(model), 0) + 1
+            self._executor.submit(self._run_batch, model, version, batch)
+
+        self.logger.debug("推理批处理线程已退出")
+
+    def _lookup_disk_cache(self, batch):
+        """在磁盘层中查找批次中的请求，命中的直接完成，返回未命中的请求"""
+        if self.result_cache is None or not self.result_cache.has_disk:
+            return batch
+        pending = []
+        for request in batch:
+            found, result = self.result_cache.get(request.digest)
+            if found:
+                request.future.set_result(result)
+            else:
+                pending.append(request)
+        return pending
+
+    def _run_batch(self, model, version, batch):
+        """在工作线程中执行一个批次"""
+        try:
+            pending = self._lookup_disk_cache(batch)
+            if pending:
+                results = model.predict_batch([request.data for request in pending])
+                if len(results) != len(pending):
+                    raise RuntimeError(
+                        f"推理结果数量不匹配: 期望 {len(pending)}，实际 {len(results)}"
+                    )
+                for request, result in zip(pending, results):
+                    if self.result_cache is not None:
+                        # 使用缓存保存的形式，与之后命中缓存的结果类型一致
+                        result = self.result_cache.put(request.digest, result, version)
+                    request.future.set_result(result)
+        except Exception as e:
+            self.logger.error(f"推理错误: {str(e)}")
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+        finally:
+            self._worker_slots.release()
+            with self._stats_lock:
+                self.batches += 1
+                self.requests += len(batch)
+            self._finish_model_use(model)
+
+    def _finish_model_use(self, model):
+        """批次结束，已被替换的模型空闲后关闭"""
+        with self._model_lock:
+            self._inflight[id(model)] -= 1
+            if self._inflight[id(model)]:
+                return
+            del self._inflight[id(model)]
+            retiring = self._retiring.pop(id(model), None)
+        if retiring is not None:
+            self._retire_model(*retiring)
+
+    def _retire_model(self, model, on_retired):
+        """关闭旧模型并通知调用方"""
+        try:
+            if hasattr(model, "close"):
+                model.close()
+            if on_retired is not None:
+                on_retired()
+            self.logger.info("旧推理模型已释放")
+        except Exception as e:
+            self.logger.error(f"释放旧推理模型错误: {str(e)}")
+
+    def wait_ready(self, timeout=None):
+        """等待初始模型创建完成或失败
+
+        返回: bool - 是否在超时前完成
+        """
+        return self._ready_event.wait(timeout)
+
+    def swap_model(self, model, model_version=None, on_retired=None):
+        """切换到已加载的新模型，需在 start() 之后调用
+
+        初始模型仍在创建时会等待其完成，避免新模型被初始模型覆盖。
+
+        Args:
+            model: 新模型对象，应在调用前加载完成，避免阻塞推理
+            model_version: 新模型版本，结果缓存会绑定到该版本
+            on_retired: 旧模型空闲并关闭后调用的无参回调
+        """
+        self._ready_event.wait()
+        if self._start_error is not None:
+            raise RuntimeError("推理服务未启动") from self._start_error
+        with self._model_lock:
+            old_model = self._model
+            self._model, self._model_version = model, model_version
+            if self.result_cache is not None:
+                self.result_cache.bind_version(model_version)
+            old_idle = old_model is not None and not self._inflight.get(id(old_model))
+            if old_model is not None and not old_idle:
+                self._retiring[id(old_model)] = (old_model, on_retired)
+        self.logger.info(f"推理模型已切换到版本 {model_version}")
+        if old_idle:
+            self._retire_model(old_model, on_retired)
+
+    def stop(self):
+        """停止服务，已提交的请求会处理完成后再退出"""
+        if self._batch_thread is None:
+            return
+        self._stop_event.set()
+        self._queue.put(None)
+        self._batch_thread.join()
+        self._executor.shutdown(wait=True)
+        if self._model is not None and hasattr(self._model, "close"):
+            self._model.close()
+        self._model = None
+        self._batch_thread = None
+        self.logger.info("推理服务已停止")
+
+    def get_stats(self):
+        """获取统计信息"""
+        with self._stats_lock:
+            average = self.requests / self.batches if self.batches else 0.0
+            return {
+                "batches": self.batches,
+                "requests": self.requests,
+                "average_batch_size": average,
+            }
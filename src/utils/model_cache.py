@@ -0,0 +1,215 @@
+import threading
+from collections import OrderedDict
+from .logger import get_logger
+from .config import get_config
+
+
+class _CacheEntry:
+    """缓存条目"""
+
+    __slots__ = ("value", "size", "pins")
+
+    def __init__(self, value, size):
+        self.value = value
+        self.size = size
+        self.pins = 0
+
+
+class LoadedModel:
+    """已构建的推理后端模型及其模型文件映射，作为模型缓存的条目
+
+    占用字节数优先使用后端模型的 memory_bytes 属性（后端自己分配的内存），
+    后端未报告时按模型文件大小估算
+    """
+
+    def __init__(self, model, model_file=None):
+        self.model = model
+        self.model_file = model_file
+        size = getattr(model, "memory_bytes", None)
+        if size is None:
+            size = model_file.size if model_file is not None else 0
+        self.size = size
+
+    def close(self):
+        """关闭后端模型并解除模型文件映射"""
+        try:
+            if hasattr(self.model, "close"):
+                self.model.close()
+        finally:
+            if self.model_file is not None:
+                self.model_file.close()
+
+
+class PinnedModel:
+    """模型缓存中已固定模型的使用句柄
+
+    属性访问转发给后端模型，可以直接交给推理服务使用；
+    close() 只取消固定，模型本身由缓存在淘汰时关闭
+    """
+
+    def __init__(self, cache, key, loaded):
+        self._cache = cache
+        self._key = key
+        self._loaded = loaded
+        self._closed = False
+
+    def __getattr__(self, name):
+        return getattr(self._loaded.model, name)
+
+    def close(self):
+        """取消固定，重复调用无效"""
+        if self._closed:
+            return
+        self._closed = True
+        self._cache.release(self._key)
+
+
+class ModelCache:
+    """已构建模型的 LRU 缓存，键为 (model_name, version)
+
+    缓存的是推理后端构建好的模型（LoadedModel），切换回已缓存的版本时不必重新构建。
+    使用中的模型通过 acquire() 固定，固定的条目不会被淘汰；
+    缓存总大小超过预算时，按最近最少使用顺序淘汰未固定的条目并调用其 close()。
+    """
+
+    def __init__(self, budget_bytes):
+        self.logger = get_logger()
+        self.budget_bytes = budget_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+
+        # 统计信息
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def acquire(self, key, loader):
+        """获取并固定模型，未缓存时调用 loader() 加载
+
+        Args:
+            key: (model_name, version)
+            loader: 无参可调用对象，返回模型对象（通过 size 属性报告占用字节数）
+        返回: 缓存中的模型对象，用完后需调用 release(key)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                entry.pins += 1
+                self._entries.move_to_end(key)
+                self.logger.debug(f"模型缓存命中: {key}")
+                return entry.value
+            self.misses += 1
+
+        # 在锁外加载，避免阻塞其他模型的读取
+        self.logger.debug(f"模型缓存未命中，开始加载: {key}")
+        value = loader()
+
+        evicted = []
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                # 加载期间其他线程已放入缓存，使用已有条目
+                evicted.append(value)
+            else:
+                entry = _CacheEntry(value, getattr(value, "size", 0))
+                self._entries[key] = entry
+                self._total_bytes += entry.size
+            entry.pins += 1
+            self._entries.move_to_end(key)
+            evicted.extend(self._evict_locked())
+
+        self._close_values(evicted)
+        return entry.value
+
+    def pin(self, key, loader):
+        """获取并固定模型，返回 PinnedModel 句柄，句柄的 close() 取消固定"""
+        return PinnedModel(self, key, self.acquire(key, loader))
+
+    def release(self, key):
+        """取消固定模型，超出预算时可能被淘汰"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.pins == 0:
+                self.logger.warning(f"释放未固定的模型: {key}")
+                return
+            entry.pins -= 1
+            evicted = self._evict_locked()
+        self._close_values(evicted)
+
+    def _evict_locked(self):
+        """淘汰未固定的最久未使用条目，直到不超过预算，返回被淘汰的模型"""
+        evicted = []
+        for key in list(self._entries):
+            if self._total_bytes <= self.budget_bytes:
+                break
+            entry = self._entries[key]
+            if entry.pins:
+                continue
+            del self._entries[key]
+            self._total_bytes -= entry.size
+            self.evictions += 1
+            evicted.append(entry.value)
+            self.logger.info(f"淘汰缓存模型: {key} ({entry.size} 字节)")
+
+        if self._total_bytes > self.budget_bytes:
+            self.logger.warning(
+                f"使用中的模型超出缓存预算: {self._total_bytes} > {self.budget_bytes}"
+            )
+        return evicted
+
+    def _close_values(self, values):
+        """关闭被淘汰的模型"""
+        for value in values:
+            if hasattr(value, "close"):
+                try:
+                    value.close()
+                except Exception as e:
+                    self.logger.error(f"关闭模型错误: {str(e)}")
+
+    def contains(self, key):
+        """模型是否已缓存"""
+        with self._lock:
+            return key in self._entries
+
+    def clear(self):
+        """清空所有未固定的条目"""
+        with self._lock:
+            evicted = [
+                self._entries.pop(key).value
+                for key in list(self._entries)
+                if not self._entries[key].pins
+            ]
+            self._total_bytes = sum(entry.size for entry in self._entries.values())
+        self._close_values(evicted)
+
+    def get_stats(self):
+        """获取统计信息"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "pinned": sum(1 for entry in self._entries.values() if entry.pins),
+                "bytes": self._total_bytes,
+                "budget_bytes": self.budget_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+_model_cache = None
+_model_cache_lock = threading.Lock()
+
+
+# 全局函数获取模型缓存实例
+def get_model_cache() -> ModelCache:
+    """获取全局模型缓存实例，预算由 [Model] cache_budget 配置"""
+    global _model_cache
+    with _model_cache_lock:
+        if _model_cache is None:
+            budget = get_config().getint("Model", "cache_budget", 4 * 1024**3)
+            _model_cache = ModelCache(budget)
+        return _model_cache
@@ -0,0 +1,108 @@
+import os
+import mmap
+import hashlib
+import threading
+from .logger import get_logger
+
+
+class MappedModelFile:
+    """只读内存映射的模型文件
+
+    模型内容不会读入 Python 堆，推理代码通过 view() 获取零拷贝的 memoryview 切片。
+    映射页来自系统页缓存，多个窗口和多个进程打开同一文件时共享同一份物理内存。
+    请通过 open_model_file() 获取实例，同一进程内相同文件只映射一次。
+    """
+
+    def __init__(self, path):
+        self.logger = get_logger()
+        self.path = path
+        self._refcount = 0
+        self._key = None
+
+        with open(path, "rb") as f:
+            self.size = os.fstat(f.fileno()).st_size
+            # 空文件无法映射，使用空缓冲区代替
+            if self.size:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._mmap = None
+        self._buffer = memoryview(self._mmap) if self._mmap else memoryview(b"")
+
+    @property
+    def buffer(self):
+        """整个文件的只读 memoryview"""
+        return self._buffer
+
+    def view(self, offset=0, length=None):
+        """获取文件区间的零拷贝 memoryview 切片"""
+        if offset < 0 or offset > self.size:
+            raise ValueError(f"偏移量越界: {offset}")
+        end = self.size if length is None else offset + length
+        if end > self.size:
+            raise ValueError(f"区间越界: {offset}+{length} > {self.size}")
+        return self._buffer[offset:end]
+
+    def sha256(self, chunk_size=16 * 1024 * 1024):
+        """计算文件的 SHA-256，直接在映射上分块计算，不复制文件内容"""
+        digest = hashlib.sha256()
+        for offset in range(0, self.size, chunk_size):
+            digest.update(self._buffer[offset : offset + chunk_size])
+        return digest.hexdigest()
+
+    def verify(self, expected_sha256):
+        """校验文件完整性"""
+        return self.sha256() == expected_sha256.lower()
+
+    def close(self):
+        """释放引用，最后一个引用释放时解除映射"""
+        with _registry_lock:
+            self._refcount -= 1
+            if self._refcount > 0:
+                return
+            if _registry.get(self._key) is self:
+                del _registry[self._key]
+        self._unmap()
+
+    def _unmap(self):
+        """解除映射"""
+        try:
+            self._buffer.release()
+            if self._mmap is not None:
+                self._mmap.close()
+        except BufferError:
+            # 仍有外部 memoryview 引用映射，由垃圾回收在引用释放后解除
+            self.logger.warning(f"模型文件仍被引用，延迟解除映射: {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# 进程内已映射的模型文件，键为 (真实路径, 修改时间, 文件大小)
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def open_model_file(path):
+    """以只读内存映射方式打开模型文件
+
+    同一进程内重复打开同一文件会返回同一个映射并增加引用计数，
+    每次打开都需要对应一次 close()。文件被替换后会重新映射。
+    """
+    real_path = os.path.realpath(path)
+    stat = os.stat(real_path)
+    key = (real_path, stat.st_mtime_ns, stat.st_size)
+
+    with _registry_lock:
+        model_file = _registry.get(key)
+        if model_file is None:
+            model_file = MappedModelFile(real_path)
+            model_file._key = key
+            _registry[key] = model_file
+            model_file.logger.debug(
+                f"模型文件已映射: {real_path} ({model_file.size} 字节)"
+            )
+        model_file._refcount += 1
+        return model_file
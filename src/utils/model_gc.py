@@ -0,0 +1,136 @@
+import os
+import sys
+import time
+import threading
+from .logger import get_logger
+
+
+def lower_io_priority():
+    """降低当前线程的 CPU 和 I/O 优先级
+
+    Linux 上未单独设置 I/O 优先级时，I/O 优先级由 nice 值推导，
+    因此把当前线程的 nice 值调到最低即可同时降低 I/O 优先级。其他平台不做处理。
+    """
+    if not sys.platform.startswith("linux"):
+        return
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except (AttributeError, OSError):
+        pass
+
+
+class ModelGarbageCollector:
+    """模型目录垃圾回收器
+
+    保留当前版本和最近的 keep_versions 个历史版本（用于回滚或作为增量更新的基础），
+    删除更早的模型文件；quota_bytes 大于 0 时，继续从最旧的历史版本开始删除直到不超过配额。
+    长时间未修改的 .partial 暂存文件视为中断下载的残留，一并删除。
+    只删除版本历史中记录的模型文件和 .partial 文件，不会删除目录中的其他文件。
+    """
+
+    def __init__(
+        self,
+        model_dir,
+        keep_versions=2,
+        quota_bytes=0,
+        partial_max_age=24 * 3600,
+        pause_seconds=0.05,
+    ):
+        """
+        Args:
+            model_dir: 模型目录
+            keep_versions: 除当前版本外保留的历史版本数
+            quota_bytes: 模型文件总大小配额（字节），0 表示不限制
+            partial_max_age: .partial 文件超过该时长（秒）未修改时删除
+            pause_seconds: 每次删除后的停顿，减少对前台 I/O 的影响
+        """
+        self.logger = get_logger()
+        self.model_dir = model_dir
+        self.keep_versions = keep_versions
+        self.quota_bytes = quota_bytes
+        self.partial_max_age = partial_max_age
+        self.pause_seconds = pause_seconds
+
+    def _file_size(self, model_name):
+        """获取模型文件大小，文件不存在时返回 0"""
+        try:
+            return os.path.getsize(os.path.join(self.model_dir, model_name))
+        except OSError:
+            return 0
+
+    def _remove(self, file_name):
+        """删除模型目录中的文件，返回释放的字节数"""
+        path = os.path.join(self.model_dir, file_name)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            # Windows 上文件仍被映射时无法删除，留到下次回收
+            self.logger.warning(f"删除模型文件失败: {path} ({str(e)})")
+            return None
+        self.logger.info(f"已删除旧模型文件: {path} ({size} 字节)")
+        time.sleep(self.pause_seconds)
+        return size
+
+    def _plan(self, active_info, history):
+        """计算需要删除的历史版本，返回 (保留列表, 删除列表)"""
+        active_name = active_info["model_name"] if active_info else None
+        # 历史按激活顺序排列，最新的在最后
+        previous = [
+            info for info in reversed(history) if info["model_name"] != active_name
+        ]
+        keep = previous[: self.keep_versions]
+        remove = previous[self.keep_versions :]
+
+        if self.quota_bytes > 0:
+            total = self._file_size(active_name) if active_name else 0
+            total += sum(self._file_size(info["model_name"]) for info in keep)
+            while keep and total > self.quota_bytes:
+                oldest = keep.pop()
+                total -= self._file_size(oldest["model_name"])
+                remove.append(oldest)
+            if total > self.quota_bytes:
+                self.logger.warning(
+                    f"当前版本模型超出磁盘配额: {total} > {self.quota_bytes}"
+                )
+        return keep, remove
+
+    def collect(self, active_info, history):
+        """执行一次垃圾回收
+
+        Args:
+            active_info: 当前版本信息
+            history: 版本历史列表，按激活顺序排列
+        返回: (list, int) - (回收后的版本历史, 释放的字节数)
+        """
+        freed = 0
+        _, remove = self._plan(active_info, history)
+        removed_names = set()
+        for info in remove:
+            size = self._remove(info["model_name"])
+            if size is not None:
+                freed += size
+                removed_names.add(info["model_name"])
+
+        # 清理中断下载残留的 .partial 文件
+        now = time.time()
+        for file_name in os.listdir(self.model_dir):
+            if not file_name.endswith(".partial"):
+                continue
+            path = os.path.join(self.model_dir, file_name)
+            try:
+                if now - os.path.getmtime(path) < self.partial_max_age:
+                    continue
+            except OSError:
+                continue
+            size = self._remove(file_name)
+            if size:
+                freed += size
+
+        remaining = [
+            info for info in history if info["model_name"] not in removed_names
+        ]
+        self.logger.info(f"模型垃圾回收完成，释放 {freed} 字节")
+        return remaining, freed
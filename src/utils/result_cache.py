@@ -0,0 +1,250 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from .logger import get_logger
+
+
+def input_digest(data):
+    """计算推理输入的内容哈希"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    elif not isinstance(data, (bytes, bytearray, memoryview)):
+        data = json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResultCache:
+    """推理结果缓存，键为 (模型版本, 输入内容哈希)
+
+    内存层为 LRU 字典；可选的磁盘层使用 sqlite 持久化，按总大小上限淘汰最久未访问的结果。
+    绑定的模型版本变化时（例如 version.json 中的版本更新），旧版本的结果全部失效。
+    缓存命中时返回的是同一个结果对象，调用方不应修改它。
+
+    启用磁盘层时，可序列化的结果按 JSON 往返后的形式保存在两层中（例如元组变为列表），
+    无论从哪一层命中，返回的类型都相同。内存层和磁盘层使用各自的锁，
+    只查内存层的调用不会被磁盘 I/O 阻塞。
+    """
+
+    def __init__(self, memory_entries=1024, disk_path=None, disk_max_bytes=0):
+        """
+        Args:
+            memory_entries: 内存层最多保存的结果数
+            disk_path: sqlite 数据库路径，为 None 时不启用磁盘层
+            disk_max_bytes: 磁盘层结果总大小上限（字节）
+        """
+        self.logger = get_logger()
+        self.memory_entries = memory_entries
+        self.disk_max_bytes = disk_max_bytes
+        self.version = None
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()  # 保护内存层、版本和统计信息
+        self._disk_lock = threading.Lock()  # 保护磁盘层
+        self._db = None
+        self._disk_bytes = 0
+
+        # 统计信息
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if disk_path:
+            self._open_disk(disk_path)
+
+    def _open_disk(self, disk_path):
+        """打开磁盘层数据库"""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(disk_path)), exist_ok=True)
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "version TEXT, digest TEXT, value TEXT, size INTEGER, "
+                "accessed REAL, PRIMARY KEY (version, digest))"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)"
+            )
+            self._db.commit()
+            self._disk_bytes = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()[0]
+            self.logger.debug(f"推理结果磁盘缓存已打开: {disk_path}")
+        except sqlite3.Error as e:
+            self.logger.error(f"打开推理结果磁盘缓存错误: {str(e)}")
+            self._db = None
+
+    @property
+    def has_disk(self):
+        """是否启用了磁盘层"""
+        return self._db is not None
+
+    def bind_version(self, version):
+        """绑定模型版本，版本变化时清除旧版本的结果"""
+        with self._disk_lock, self._lock:
+            if version == self.version:
+                return
+            self.logger.info(f"推理结果缓存绑定模型版本: {self.version} -> {version}")
+            self.version = version
+            self._memory.clear()
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "DELETE FROM results WHERE version != ?", (version,)
+                    )
+                    self._db.commit()
+                    self._disk_bytes = self._db.execute(
+                        "SELECT COALESCE(SUM(size), 0) FROM results"
+                    ).fetchone()[0]
+                except sqlite3.Error as e:
+                    self.logger.error(f"清除推理结果磁盘缓存错误: {str(e)}")
+
+    def get(self, digest, memory_only=False):
+        """查找结果
+
+        Args:
+            digest: 输入内容哈希
+            memory_only: 为 True 时只查内存层，不进行磁盘 I/O
+        返回: (bool, object) - (是否命中, 结果)
+        """
+        with self._lock:
+            version = self.version
+            key = (version, digest)
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return True, self._memory[key]
+            if self._db is None:
+                self.misses += 1
+                return False, None
+            if memory_only:
+                # 之后的磁盘层查找会计入统计
+                return False, None
+
+        row, value = None, None
+        with self._disk_lock:
+            try:
+                if self._db is None:
+                    raise sqlite3.ProgrammingError("磁盘缓存已关闭")
+                row = self._db.execute(
+                    "SELECT value FROM results WHERE digest = ? AND version = ?",
+                    (digest, version),
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE results SET accessed = ? "
+                        "WHERE version = ? AND digest = ?",
+                        (time.time(), version, digest),
+                    )
+                    value = json.loads(row[0])
+            except sqlite3.Error as e:
+                self.logger.error(f"读取推理结果磁盘缓存错误: {str(e)}")
+                row = None
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return False, None
+            if version == self.version:
+                self._put_memory_locked(key, value)
+            self.disk_hits += 1
+            return True, value
+
+    def put(self, digest, value, version=None):
+        """保存结果
+
+        指定 version 且与当前绑定的版本不同时（例如切换版本前开始的推理）不保存
+        返回: 缓存中保存的结果；启用磁盘层时为 JSON 往返后的形式，调用方应使用该返回值，
+              使首次结果与之后命中缓存的结果类型一致
+        """
+        payload = None
+        if self._db is not None:
+            try:
+                payload = json.dumps(value)
+                value = json.loads(payload)
+            except (TypeError, ValueError):
+                # 无法序列化的结果只保存在内存层
+                payload = None
+
+        with self._lock:
+            if version is not None and version != self.version:
+                return value
+            version = self.version
+            self._put_memory_locked((version, digest), value)
+        if payload is not None:
+            with self._disk_lock:
+                if self._db is not None and version == self.version:
+                    self._put_disk_locked(version, digest, payload)
+        return value
+
+    def _put_memory_locked(self, key, value):
+        """写入内存层，超出条目数时淘汰最久未使用的结果"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _put_disk_locked(self, version, digest, payload):
+        """写入磁盘层，超出大小上限时淘汰最久未访问的结果"""
+        size = len(payload)
+        if size > self.disk_max_bytes:
+            return
+
+        try:
+            row = self._db.execute(
+                "SELECT size FROM results WHERE version = ? AND digest = ?",
+                (version, digest),
+            ).fetchone()
+            if row is not None:
+                self._disk_bytes -= row[0]
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (version, digest, payload, size, time.time()),
+            )
+            self._disk_bytes += size
+
+            while self._disk_bytes > self.disk_max_bytes:
+                rows = self._db.execute(
+                    "SELECT version, digest, size FROM results "
+                    "ORDER BY accessed LIMIT 64"
+                ).fetchall()
+                if not rows:
+                    break
+                for old_version, old_digest, old_size in rows:
+                    self._db.execute(
+                        "DELETE FROM results WHERE version = ? AND digest = ?",
+                        (old_version, old_digest),
+                    )
+                    self._disk_bytes -= old_size
+                    if self._disk_bytes <= self.disk_max_bytes:
+                        break
+            self._db.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"写入推理结果磁盘缓存错误: {str(e)}")
+
+    def close(self):
+        """关闭磁盘层"""
+        with self._disk_lock:
+            if self._db is not None:
+                self._db.commit()
+                self._db.close()
+                self._db = None
+
+    def get_stats(self):
+        """获取统计信息"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            hits = self.memory_hits + self.disk_hits
+            return {
+                "version": self.version,
+                "memory_entries": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
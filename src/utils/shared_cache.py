@@ -0,0 +1,230 @@
+import os
+import sys
+import time
+import shutil
+from .logger import get_logger
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    """跨进程文件锁
+
+    POSIX 上使用 flock，Windows 上使用 msvcrt.locking。
+    持有锁的进程退出时操作系统会自动释放锁，不会留下死锁。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+
+    def _open(self):
+        """打开锁文件，新建的锁文件对所有用户可写"""
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+        except PermissionError:
+            # 其他用户创建的锁文件可能不可写，flock 只需要只读打开
+            return os.open(self.path, os.O_RDONLY)
+        if hasattr(os, "fchmod"):
+            try:
+                # 创建时的权限受 umask 影响，这里显式放开
+                os.fchmod(fd, 0o666)
+            except OSError:
+                pass  # 不是锁文件的所有者
+        return fd
+
+    def acquire(self, blocking=True):
+        """获取锁，blocking 为 False 时获取失败立即返回 False"""
+        fd = self._open()
+        try:
+            if sys.platform == "win32":
+                mode = msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK
+                msvcrt.locking(fd, mode, 1)
+            else:
+                flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+                fcntl.flock(fd, flags)
+        except OSError:
+            os.close(fd)
+            if blocking:
+                raise
+            return False
+        self._fd = fd
+        return True
+
+    def release(self):
+        """释放锁"""
+        if self._fd is None:
+            return
+        try:
+            if sys.platform == "win32":
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+
+def _reflink(src, dst):
+    """尝试以写时复制方式克隆文件（Linux 上 Btrfs/XFS 等支持 FICLONE）"""
+    if not sys.platform.startswith("linux"):
+        return False
+    ficlone = 0x40049409
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), ficlone, fsrc.fileno())
+            return True
+        except OSError:
+            pass
+    os.remove(dst)
+    return False
+
+
+def link_file(src, dst):
+    """把文件放到目标路径，依次尝试硬链接、reflink、复制
+
+    返回: str - 实际使用的方式 ("hardlink" / "reflink" / "copy")
+    """
+    tmp_path = f"{dst}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        os.link(src, tmp_path)
+        method = "hardlink"
+    except OSError:
+        if _reflink(src, tmp_path):
+            method = "reflink"
+        else:
+            shutil.copyfile(src, tmp_path)
+            method = "copy"
+    os.replace(tmp_path, dst)
+    return method
+
+
+class SharedModelCache:
+    """机器级共享模型缓存
+
+    多个用户或应用实例共用一个缓存目录。同一个模型文件只由拿到文件锁的进程下载，
+    下载进度写入 <名称>.progress 文件，其他进程轮询该文件获得同一个进度流，
+    锁释放后直接从缓存目录以硬链接（或 reflink、复制）方式取得文件。
+    缓存目录需要对所有使用者可写，由本进程创建时会放开为所有用户可写。
+    """
+
+    def __init__(self, root, poll_interval=0.5):
+        self.logger = get_logger()
+        self.root = root
+        self.poll_interval = poll_interval
+        os.makedirs(root, mode=0o777, exist_ok=True)
+        try:
+            # 创建时的权限受 umask 影响，这里显式放开；
+            # 不设置粘滞位，其他用户需要替换 .progress 等文件
+            os.chmod(root, 0o777)
+        except OSError:
+            pass  # 不是缓存目录的所有者
+
+    def _path(self, name, suffix=""):
+        """缓存目录中的文件路径"""
+        return os.path.join(self.root, f"{name}{suffix}")
+
+    def _write_progress(self, name, value):
+        """写入下载进度"""
+        progress_path = self._path(name, ".progress")
+        tmp_path = f"{progress_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(str(value))
+            os.replace(tmp_path, progress_path)
+        except OSError as e:
+            self.logger.debug(f"写入共享下载进度失败: {str(e)}")
+
+    def _read_progress(self, name):
+        """读取其他进程写入的下载进度，读取失败时返回 None"""
+        try:
+            with open(self._path(name, ".progress"), "r", encoding="utf-8") as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    def fetch(self, name, download, report_progress=None):
+        """确保缓存中存在该文件，必要时下载
+
+        Args:
+            name: 缓存中的文件名，应包含版本信息以区分不同版本
+            download: 可调用对象 download(dest_path, report_progress)，
+                      把文件下载到 dest_path
+            report_progress: 可选的进度回调 report_progress(int)
+        返回: str - 缓存中的文件路径
+        """
+        artifact_path = self._path(name)
+        lock = FileLock(self._path(name, ".lock"))
+        last_progress = None
+
+        while True:
+            if os.path.exists(artifact_path):
+                return artifact_path
+
+            if lock.acquire(blocking=False):
+                try:
+                    # 拿到锁之前其他进程可能已经下载完成
+                    if os.path.exists(artifact_path):
+                        return artifact_path
+                    self.logger.info(f"共享缓存中没有 {name}，由当前进程下载")
+                    self._download(name, download, report_progress)
+                    return artifact_path
+                finally:
+                    lock.release()
+
+            # 其他进程正在下载，跟随其进度直到锁释放
+            progress = self._read_progress(name)
+            if progress is not None and progress != last_progress:
+                last_progress = progress
+                if report_progress:
+                    report_progress(progress)
+            time.sleep(self.poll_interval)
+
+    def _remove_stale_partials(self, name):
+        """删除中断下载残留的暂存文件，持有锁时调用，此时没有其他进程在下载该文件"""
+        prefix = f"{name}."
+        for file_name in os.listdir(self.root):
+            if file_name.startswith(prefix) and file_name.endswith(".partial"):
+                try:
+                    os.remove(os.path.join(self.root, file_name))
+                    self.logger.info(f"已删除共享缓存中的残留暂存文件: {file_name}")
+                except OSError as e:
+                    self.logger.warning(f"删除残留暂存文件失败: {file_name} ({str(e)})")
+
+    def _download(self, name, download, report_progress):
+        """持有锁时下载文件，完成后原子放入缓存
+
+        暂存文件名包含进程号，下载失败时删除，不会留下其他用户无法覆盖的文件
+        """
+        self._remove_stale_partials(name)
+        partial_path = self._path(name, f".{os.getpid()}.partial")
+
+        def report(value):
+            self._write_progress(name, value)
+            if report_progress:
+                report_progress(value)
+
+        self._write_progress(name, 0)
+        try:
+            download(partial_path, report)
+            if not os.path.exists(partial_path):
+                raise FileNotFoundError(f"下载未生成文件: {partial_path}")
+            os.chmod(partial_path, 0o644)
+            os.replace(partial_path, self._path(name))
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        self._write_progress(name, 100)
+
+    def fetch_into(self, name, dest_path, download, report_progress=None):
+        """从共享缓存取得文件并放到 dest_path，必要时先下载"""
+        artifact_path = self.fetch(name, download, report_progress)
+        method = link_file(artifact_path, dest_path)
+        self.logger.info(f"已从共享缓存取得 {name}（{method}）: {dest_path}")
+        return dest_path
@@ -0,0 +1,166 @@
+import os
+import hashlib
+from typing import Dict
+from .config import get_config
+from .logger import get_logger
+
+
+# 参与主题编译的配置段及其默认值
+THEME_DEFAULTS = {
+    "LoginStyle": {
+        "window_background": "white",
+        "login_button_background": "#07C160",
+        "login_button_hover": "#06B057",
+        "login_button_pressed": "#059A4C",
+        "title_label_color": "#353535",
+        "status_label_color": "#888888",
+    },
+    "UserStyle": {
+        "window_background": "white",
+        "welcome_label_color": "#353535",
+    },
+}
+
+# 应用级样式表模板，窗口只需设置对应的 objectName
+THEME_TEMPLATE = """
+QMainWindow#loginWindow {{
+    background-color: {login_window_background};
+}}
+QMainWindow#loginWindow QPushButton#loginButton {{
+    background-color: {login_login_button_background};
+    border: none;
+    color: white;
+    padding: 10px;
+    border-radius: 4px;
+    font-size: 16px;
+}}
+QMainWindow#loginWindow QPushButton#loginButton:hover {{
+    background-color: {login_login_button_hover};
+}}
+QMainWindow#loginWindow QPushButton#loginButton:pressed {{
+    background-color: {login_login_button_pressed};
+}}
+QMainWindow#loginWindow QLabel#titleLabel {{
+    color: {login_title_label_color};
+    font-size: 24px;
+    font-weight: bold;
+}}
+QMainWindow#loginWindow QLabel#statusLabel {{
+    color: {login_status_label_color};
+    font-size: 14px;
+}}
+QMainWindow#userWindow {{
+    background-color: {user_window_background};
+}}
+QMainWindow#userWindow QLabel#welcomeLabel {{
+    color: {user_welcome_label_color};
+    font-size: 24px;
+    font-weight: bold;
+}}
+"""
+
+
+class Theme:
+    """主题引擎，将样式配置编译为应用级样式表
+
+    样式表只在首次使用时编译一次并缓存在内存中，
+    可选地按配置哈希缓存到磁盘，避免每个窗口单独解析样式。
+    """
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not Theme._initialized:
+            Theme._initialized = True
+            self.logger = get_logger()
+            self.config = get_config()
+            self._stylesheet = None
+
+    def _collect_values(self) -> Dict[str, str]:
+        """读取样式配置，返回模板变量"""
+        values = {}
+        prefixes = {"LoginStyle": "login", "UserStyle": "user"}
+        for section, defaults in THEME_DEFAULTS.items():
+            prefix = prefixes[section]
+            for key, default in defaults.items():
+                values[f"{prefix}_{key}"] = self.config.get(section, key, default)
+        return values
+
+    def _config_hash(self, values: Dict[str, str]) -> str:
+        """计算样式模板和样式配置的哈希，作为磁盘缓存的键
+
+        模板内容参与哈希，修改模板后旧的磁盘缓存自动失效
+        """
+        digest = hashlib.sha256(THEME_TEMPLATE.encode("utf-8"))
+        for key in sorted(values):
+            digest.update(f"{key}={values[key]}\n".encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def _get_cache_path(self, config_hash: str) -> str:
+        """获取磁盘缓存文件路径"""
+        cache_dir = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+            self.config.get("Theme", "cache_dir", "cache"),
+        )
+        return os.path.join(cache_dir, f"theme_{config_hash}.qss")
+
+    def _read_disk_cache(self, cache_path: str):
+        """读取磁盘缓存，失败时返回 None"""
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                return f.read()
+        except (FileNotFoundError, IOError):
+            return None
+
+    def _write_disk_cache(self, cache_path: str, stylesheet: str):
+        """写入磁盘缓存，先写临时文件再原子替换"""
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = f"{cache_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(stylesheet)
+            os.replace(tmp_path, cache_path)
+        except IOError as e:
+            self.logger.warning(f"写入主题缓存失败: {str(e)}")
+
+    def compile(self) -> str:
+        """编译样式表"""
+        values = self._collect_values()
+        use_disk_cache = self.config.getboolean("Theme", "disk_cache", False)
+
+        cache_path = None
+        if use_disk_cache:
+            cache_path = self._get_cache_path(self._config_hash(values))
+            cached = self._read_disk_cache(cache_path)
+            if cached is not None:
+                self.logger.debug(f"从磁盘缓存加载主题: {cache_path}")
+                return cached
+
+        stylesheet = THEME_TEMPLATE.format(**values)
+        if cache_path:
+            self._write_disk_cache(cache_path, stylesheet)
+        self.logger.debug("主题样式表编译完成")
+        return stylesheet
+
+    def stylesheet(self) -> str:
+        """获取编译后的样式表（带内存缓存）"""
+        if self._stylesheet is None:
+            self._stylesheet = self.compile()
+        return self._stylesheet
+
+    def apply(self, app):
+        """将样式表设置到 QApplication 上，只需调用一次"""
+        app.setStyleSheet(self.stylesheet())
+        self.logger.info("应用主题已加载")
+
+
+# 全局函数获取主题实例
+def get_theme() -> Theme:
+    """获取全局主题实例"""
+    return Theme()
@@ -0,0 +1,207 @@
+import time
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from utils.logger import get_logger
+
+
+class ComponentSpec:
+    """组件描述信息"""
+
+    def __init__(
+        self, name, factory, dependencies=None, cost=1, priority=0, lazy=False
+    ):
+        """
+        Args:
+            name: 组件名称
+            factory: 构建组件的无参可调用对象，返回值作为组件实例保存
+            dependencies: 依赖的组件名称列表，依赖会先于本组件构建
+            cost: 预估构建耗时（毫秒），用于分帧调度
+            priority: 优先级，数值越小越先构建
+            lazy: 是否延迟到首次显示时才构建
+        """
+        self.name = name
+        self.factory = factory
+        self.dependencies = list(dependencies or [])
+        self.cost = cost
+        self.priority = priority
+        self.lazy = lazy
+
+
+class ComponentLoader(QObject):
+    """组件加载器，在多个事件循环周期内按优先级增量构建组件
+
+    每个周期只在时间预算内构建组件，剩余组件通过 QTimer 让出事件循环后继续，
+    避免组件增多时窗口长时间无响应。延迟组件在首次调用 reveal() 时构建。
+    构建失败的组件及依赖它的组件标记为失败并跳过，其他组件照常构建。
+    """
+
+    # 定义信号
+    component_loaded = pyqtSignal(str)  # 单个组件构建完成信号
+    all_loaded = pyqtSignal()  # 所有非延迟组件构建完成（或失败）信号
+    component_failed = pyqtSignal(str, str)  # 组件构建失败信号，参数为组件名称和错误信息
+
+    def __init__(self, budget_ms=8, parent=None):
+        super().__init__(parent)
+        self.logger = get_logger()
+        self.budget_ms = budget_ms
+        self._specs = {}
+        self._components = {}
+        self._failed = {}  # 构建失败的组件名称 -> 错误信息
+        self._started = False
+        self._finished = False
+        self._start_time = None
+
+    def register(
+        self, name, factory, dependencies=None, cost=1, priority=0, lazy=False
+    ):
+        """注册组件"""
+        if name in self._specs:
+            raise ValueError(f"组件已注册: {name}")
+        self._specs[name] = ComponentSpec(
+            name, factory, dependencies, cost, priority, lazy
+        )
+
+    def _validate(self):
+        """检查依赖是否存在以及是否有循环依赖"""
+        visiting, visited = set(), set()
+
+        def visit(name, path):
+            if name not in self._specs:
+                raise ValueError(f"组件 {path[-1]} 依赖未注册的组件: {name}")
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"组件存在循环依赖: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dependency in self._specs[name].dependencies:
+                visit(dependency, path + [name])
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self._specs:
+            visit(name, [name])
+
+    def _required_names(self):
+        """需要预先构建的组件：非延迟组件及其全部依赖"""
+        required = set()
+        stack = [name for name, spec in self._specs.items() if not spec.lazy]
+        while stack:
+            name = stack.pop()
+            if name not in required:
+                required.add(name)
+                stack.extend(self._specs[name].dependencies)
+        return required
+
+    def _next_ready(self):
+        """选出依赖已满足且优先级最高的待构建组件"""
+        ready = [
+            self._specs[name]
+            for name in self._required_names()
+            if name not in self._components
+            and name not in self._failed
+            and all(dep in self._components for dep in self._specs[name].dependencies)
+        ]
+        if not ready:
+            return None
+        return min(ready, key=lambda spec: (spec.priority, spec.cost, spec.name))
+
+    def _mark_failed(self, name, message):
+        """把组件及所有依赖它的组件标记为失败"""
+        pending = [(name, message)]
+        while pending:
+            name, message = pending.pop()
+            if name in self._failed or name in self._components:
+                continue
+            self._failed[name] = message
+            self.component_failed.emit(name, message)
+            pending.extend(
+                (other, f"依赖的组件 {name} 构建失败")
+                for other, spec in self._specs.items()
+                if name in spec.dependencies
+            )
+
+    def _build(self, spec):
+        """构建单个组件
+        返回: bool - 是否构建成功，失败时组件及依赖它的组件被标记为失败
+        """
+        start_time = time.perf_counter()
+        try:
+            self._components[spec.name] = spec.factory()
+        except Exception as e:
+            self.logger.error(f"组件 {spec.name} 构建失败: {str(e)}")
+            self._mark_failed(spec.name, str(e))
+            return False
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        self.logger.debug(
+            f"组件 {spec.name} 构建完成，耗时 {elapsed_ms:.2f}ms（预估 {spec.cost}ms）"
+        )
+        self.component_loaded.emit(spec.name)
+        return True
+
+    def start(self):
+        """开始增量构建"""
+        if self._started:
+            return
+        self._validate()
+        self._started = True
+        self._start_time = time.perf_counter()
+        self.logger.info(f"开始加载组件，共 {len(self._specs)} 个")
+        QTimer.singleShot(0, self._tick)
+
+    def _tick(self):
+        """在一个事件循环周期内，按时间预算构建组件"""
+        tick_start = time.perf_counter()
+        built = 0
+        while True:
+            spec = self._next_ready()
+            if spec is None:
+                break
+            elapsed_ms = (time.perf_counter() - tick_start) * 1000
+            # 每个周期至少构建一个组件，超出预算的留到下个周期
+            if built and elapsed_ms + spec.cost > self.budget_ms:
+                break
+            self._build(spec)
+            built += 1
+
+        if self._next_ready() is not None:
+            QTimer.singleShot(0, self._tick)
+            return
+
+        if not self._finished:
+            self._finished = True
+            total_ms = (time.perf_counter() - self._start_time) * 1000
+            if self._failed:
+                self.logger.warning(
+                    f"组件加载完成，{len(self._failed)} 个组件构建失败: "
+                    f"{', '.join(sorted(self._failed))}"
+                )
+            self.logger.info(f"组件加载完成，可交互耗时 {total_ms:.2f}ms")
+            self.all_loaded.emit()
+
+    def reveal(self, name):
+        """获取组件，未构建时（如延迟组件）立即连同依赖一起构建
+
+        组件或其依赖构建失败时抛出 RuntimeError
+        """
+        if name not in self._specs:
+            raise KeyError(f"组件未注册: {name}")
+        if not self._started:
+            self._validate()
+        if name not in self._components and name not in self._failed:
+            for dependency in self._specs[name].dependencies:
+                self.reveal(dependency)
+            self._build(self._specs[name])
+        if name in self._failed:
+            raise RuntimeError(f"组件 {name} 构建失败: {self._failed[name]}")
+        return self._components[name]
+
+    def get(self, name):
+        """获取已构建的组件，未构建时返回 None"""
+        return self._components.get(name)
+
+    def is_loaded(self, name):
+        """组件是否已构建"""
+        return name in self._components
+
+    def is_failed(self, name):
+        """组件是否构建失败"""
+        return name in self._failed
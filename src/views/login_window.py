@@ -26,7 +26,6 @@ class LoginWindow(QMainWindow):
             window_config: 窗口配置字典，包含：
                 - title: 窗口标题
                 - size: (width, height) 窗口大小
-                - styles: 样式表
                 - login_button_text: 登录按钮文本
         """
         super().__init__()
@@ -41,36 +40,8 @@ class LoginWindow(QMainWindow):
         width, height = config.get("size", (280, 400))
         self.setGeometry(100, 100, width, height)
 
-        # 构建样式表
-        styles = f"""
-            QMainWindow {{
-                background-color: {config.get('window_background', 'white')};
-            }}
-            QPushButton#loginButton {{
-                background-color: {config.get('login_button_background', '#07C160')};
-                border: none;
-                color: white;
-                padding: 10px;
-                border-radius: 4px;
-                font-size: 16px;
-            }}
-            QPushButton#loginButton:hover {{
-                background-color: {config.get('login_button_hover', '#06B057')};
-            }}
-            QPushButton#loginButton:pressed {{
-                background-color: {config.get('login_button_pressed', '#059A4C')};
-            }}
-            QLabel#titleLabel {{
-                color: {config.get('title_label_color', '#353535')};
-                font-size: 24px;
-                font-weight: bold;
-            }}
-            QLabel#statusLabel {{
-                color: {config.get('status_label_color', '#888888')};
-                font-size: 14px;
-            }}
-        """
-        self.setStyleSheet(styles)
+        # 样式由应用级主题提供，这里只设置对象名
+        self.setObjectName("loginWindow")
 
         # 创建中央部件和布局
         central_widget = QWidget()
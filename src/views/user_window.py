@@ -1,15 +1,19 @@
-from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QLabel
+from PyQt5.QtCore import Qt, QTimer, QEvent
 from utils.logger import get_logger
 from utils.config import get_config
+from utils.activity import get_activity_monitor
+from views.component_loader import ComponentLoader
 
 
 class UserWindow(QMainWindow):
     """用户登录后的主界面"""
 
-    def __init__(self, utoken):
+    def __init__(self, utoken, inference_controller=None):
         super().__init__()
         self.utoken = utoken
+        # 推理控制器，通过 submit() 提交请求，结果由 result_ready 信号返回
+        self.inference_controller = inference_controller
         self.logger = get_logger()
         self.config = get_config()
         self.logger.info("初始化用户窗口")
@@ -17,8 +21,16 @@ class UserWindow(QMainWindow):
         # 先创建基本UI
         self.init_basic_ui()
 
-        # 使用定时器延迟加载其他组件
-        QTimer.singleShot(100, self.init_components)
+        # 监听输入事件，后台预取等任务在用户活动时暂停
+        self.activity_monitor = get_activity_monitor()
+        QApplication.instance().installEventFilter(self)
+
+        # 组件加载器，在多个事件循环周期内增量构建其他组件
+        self.component_loader = ComponentLoader(
+            self.config.getint("Window", "component_budget_ms", 8), self
+        )
+        self.init_components()
+        QTimer.singleShot(0, self.component_loader.start)
 
     def init_basic_ui(self):
         """初始化基本界面结构"""
@@ -30,18 +42,8 @@ class UserWindow(QMainWindow):
             self.config.getint("Window", "user_height", 600),
         )
 
-        # 设置样式
-        styles = f"""
-            QMainWindow {{
-                background-color: {self.config.get('UserStyle', 'window_background', 'white')};
-            }}
-            QLabel#welcomeLabel {{
-                color: {self.config.get('UserStyle', 'welcome_label_color', '#353535')};
-                font-size: 24px;
-                font-weight: bold;
-            }}
-        """
-        self.setStyleSheet(styles)
+        # 样式由应用级主题提供，这里只设置对象名
+        self.setObjectName("userWindow")
 
         # 创建中央部件和布局
         self.central_widget = QWidget()
@@ -59,18 +61,49 @@ class UserWindow(QMainWindow):
         self.logger.debug("用户窗口基本UI初始化完成")
 
     def init_components(self):
-        """延迟初始化其他组件"""
-        self.logger.info("开始初始化用户窗口组件")
+        """注册其他组件，由组件加载器按优先级分帧构建
 
-        # 更新欢迎标签
-        self.welcome_label.setText(self.config.get("UI", "welcome_text", "欢迎回来！"))
+        新增面板时在这里注册，声明依赖、预估耗时和优先级；
+        构建开销大的面板设置 lazy=True，首次显示时通过 reveal_component 构建。
+        """
+        self.component_loader.register(
+            "welcome", self._init_welcome, cost=1, priority=0
+        )
 
-        # 在这里添加其他组件的初始化
         # TODO: 添加更多组件
 
-        self.logger.debug("用户窗口组件初始化完成")
+        self.component_loader.all_loaded.connect(
+            lambda: self.logger.debug("用户窗口组件初始化完成")
+        )
+
+    def _init_welcome(self):
+        """更新欢迎标签"""
+        self.welcome_label.setText(self.config.get("UI", "welcome_text", "欢迎回来！"))
+        return self.welcome_label
+
+    def reveal_component(self, name):
+        """显示组件前调用，确保组件（包括延迟组件）已构建"""
+        return self.component_loader.reveal(name)
+
+    # 视为用户活动的输入事件
+    ACTIVITY_EVENTS = (
+        QEvent.KeyPress,
+        QEvent.MouseButtonPress,
+        QEvent.MouseMove,
+        QEvent.Wheel,
+    )
+
+    def eventFilter(self, obj, event):
+        """记录用户输入活动，不拦截事件"""
+        if event.type() in self.ACTIVITY_EVENTS:
+            self.activity_monitor.notify()
+        return False
 
     def closeEvent(self, event):
         """处理窗口关闭事件"""
         self.logger.info("用户窗口正在关闭")
+        # 应用级事件过滤器不会随窗口关闭自动移除
+        QApplication.instance().removeEventFilter(self)
+        if self.inference_controller:
+            self.inference_controller.stop()
         event.accept()  # 关闭整个应用
@@ -0,0 +1,26 @@
+import os
+import sys
+import pytest
+
+# 无显示环境时 Qt 使用 offscreen 平台
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture
+def qapp():
+    """Qt 应用实例，未安装 PyQt5 时跳过"""
+    QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+
+
+def wait_until(qapp, condition, timeout=5.0):
+    """处理 Qt 事件直到条件成立，超时返回 False"""
+    import time
+    from PyQt5.QtCore import QEventLoop
+
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        qapp.processEvents(QEventLoop.AllEvents, 10)
+    return True
@@ -0,0 +1,58 @@
+import json
+import argparse
+import pytest
+import cli
+from core.model_sync import ModelSyncEngine
+
+
+def gc_args(model_dir):
+    return argparse.Namespace(model_dir=str(model_dir), json=True)
+
+
+def test_gc_reports_freed_bytes(tmp_path, capsys):
+    assert cli.cmd_gc(gc_args(tmp_path)) == 0
+    event = json.loads(capsys.readouterr().out)
+    assert event == {"event": "gc", "freed_bytes": 0}
+
+
+def test_gc_failure_exits_with_error(tmp_path, capsys, monkeypatch):
+    monkeypatch.setattr(ModelSyncEngine, "run_garbage_collection", lambda self: None)
+    assert cli.cmd_gc(gc_args(tmp_path)) == 1
+    event = json.loads(capsys.readouterr().out)
+    assert event["event"] == "error"
+
+
+def test_failed_prefetch_exits_with_error(tmp_path, capsys, monkeypatch):
+    latest = {
+        "version": "1.0.0",
+        "model_name": "model.pt",
+        "timestamp": "2024-01-01T00:00:00Z",
+        "next": {"version": "1.1.0", "model_name": "model_next.pt"},
+    }
+
+    async def sync(self):
+        return False, latest
+
+    monkeypatch.setattr(ModelSyncEngine, "sync", sync)
+    args = argparse.Namespace(
+        model_dir=str(tmp_path), utoken=None, prefetch=True, gc=False, json=True
+    )
+    # 没有配置镜像时预取失败，不应报告成功
+    assert cli.cmd_sync_models(args) == 1
+    events = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [event["event"] for event in events] == ["done", "error"]
+
+
+def test_bench_rejects_zero_runs():
+    with pytest.raises(SystemExit):
+        cli.build_parser().parse_args(["bench", "--runs", "0"])
+
+
+def test_bench_downloads_from_stub_mirror(capsys):
+    args = cli.build_parser().parse_args(
+        ["bench", "--runs", "1", "--size-mb", "1", "--json"]
+    )
+    assert cli.cmd_bench(args) == 0
+    results = json.loads(capsys.readouterr().out)
+    assert results["size_bytes"] == 1024 * 1024
+    assert results["download"]["runs"] == 1
@@ -0,0 +1,35 @@
+import pytest
+from conftest import wait_until
+
+
+def broken():
+    raise ValueError("boom")
+
+
+def test_failed_panel_does_not_stop_others(qapp):
+    from views.component_loader import ComponentLoader
+
+    loader = ComponentLoader(budget_ms=8)
+    loader.register("bad", broken, priority=0)
+    loader.register("child", lambda: "child", dependencies=["bad"])
+    loader.register("good", lambda: "good", priority=1)
+    failed, finished = [], []
+    loader.component_failed.connect(lambda name, message: failed.append(name))
+    loader.all_loaded.connect(lambda: finished.append(True))
+
+    loader.start()
+    assert wait_until(qapp, lambda: finished)
+    assert loader.get("good") == "good"
+    assert sorted(failed) == ["bad", "child"]
+    assert loader.is_failed("child")
+
+
+def test_reveal_raises_for_failed_lazy_panel(qapp):
+    from views.component_loader import ComponentLoader
+
+    loader = ComponentLoader()
+    loader.register("heavy", broken, lazy=True)
+    with pytest.raises(RuntimeError, match="boom"):
+        loader.reveal("heavy")
+    with pytest.raises(RuntimeError):
+        loader.reveal("heavy")
@@ -0,0 +1,78 @@
+import os
+import hashlib
+import pytest
+from stub_servers import ThrottledFileServer
+from utils.downloader import DownloadError, MirrorDownloader
+
+PAYLOAD = os.urandom(4 * 1024 * 1024)
+PAYLOAD_HASH = hashlib.sha256(PAYLOAD).hexdigest()
+
+
+@pytest.fixture
+def servers():
+    """测试结束时停止所有替身服务器"""
+    started = []
+
+    def start(**options):
+        server = ThrottledFileServer({"model.bin": PAYLOAD}, **options).start()
+        started.append(server)
+        return server
+
+    yield start
+    for server in started:
+        server.stop()
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_parallel_download_from_multiple_mirrors(servers, tmp_path):
+    mirrors = [f"{servers().url}/model.bin" for _ in range(3)]
+    dest_path = tmp_path / "model.bin"
+    progress = []
+    MirrorDownloader(mirrors, segment_size=512 * 1024).download(
+        str(dest_path), progress.append, PAYLOAD_HASH
+    )
+    assert read(dest_path) == PAYLOAD
+    assert progress[-1] == 100
+
+
+def test_stalled_mirror_fails_over(servers, tmp_path):
+    # 停滞的镜像测速最快，会先被分配分段，之后必须转给正常镜像
+    stalled = servers(stall_after=1024 * 1024)
+    healthy = servers(bandwidth=16 * 1024 * 1024)
+    downloader = MirrorDownloader(
+        [f"{stalled.url}/model.bin", f"{healthy.url}/model.bin"],
+        segment_size=2 * 1024 * 1024,
+        stall_timeout=0.5,
+    )
+    dest_path = tmp_path / "model.bin"
+    downloader.download(str(dest_path), expected_sha256=PAYLOAD_HASH)
+    assert read(dest_path) == PAYLOAD
+    stats = {m["url"]: m for m in downloader.get_mirror_stats()}
+    assert stats[f"{stalled.url}/model.bin"]["failures"] >= 1
+
+
+def test_unreachable_mirror_is_skipped(servers, tmp_path):
+    healthy = servers()
+    downloader = MirrorDownloader(
+        ["http://127.0.0.1:9/model.bin", f"{healthy.url}/model.bin"],
+        stall_timeout=1.0,
+    )
+    dest_path = tmp_path / "model.bin"
+    downloader.download(str(dest_path), expected_sha256=PAYLOAD_HASH)
+    assert read(dest_path) == PAYLOAD
+
+
+def test_no_available_mirror_raises(tmp_path):
+    downloader = MirrorDownloader(["http://127.0.0.1:9/model.bin"], stall_timeout=1.0)
+    with pytest.raises(DownloadError):
+        downloader.download(str(tmp_path / "model.bin"))
+
+
+def test_checksum_mismatch_raises(servers, tmp_path):
+    downloader = MirrorDownloader([f"{servers().url}/model.bin"])
+    with pytest.raises(DownloadError):
+        downloader.download(str(tmp_path / "model.bin"), expected_sha256="0" * 64)
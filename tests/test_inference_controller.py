@@ -0,0 +1,38 @@
+from conftest import wait_until
+from utils.inference_service import DummyModel
+
+
+class StubModelController:
+    """只提供推理控制器所需接口的模型控制器替身"""
+
+    current_model = {"version": "1", "model_name": "model.pt"}
+
+    def load_model(self, version_info=None):
+        return DummyModel(batch_overhead_ms=0, per_item_ms=0)
+
+
+def test_signals_follow_returned_request_id(qapp):
+    from controllers.inference_controller import InferenceController
+
+    controller = InferenceController(StubModelController())
+    controller.start()
+    events = []
+    controller.result_ready.connect(lambda rid, _: events.append(("signal", rid)))
+    controller.inference_failed.connect(lambda rid, _: events.append(("failed", rid)))
+    try:
+        first = controller.submit("query")
+        assert wait_until(qapp, lambda: ("signal", first) in events)
+
+        # 第二次提交命中内存缓存，Future 在 submit() 返回前已经完成
+        events.clear()
+        events.append(("returned", controller.submit("query")))
+        assert wait_until(qapp, lambda: len(events) == 2)
+        assert events == [("returned", 2), ("signal", 2)]
+    finally:
+        controller.stop()
+
+    # 服务停止后提交失败，失败信号同样在返回请求ID之后
+    events.clear()
+    events.append(("returned", controller.submit("query")))
+    assert wait_until(qapp, lambda: len(events) == 2)
+    assert events == [("returned", 3), ("failed", 3)]
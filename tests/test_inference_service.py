@@ -0,0 +1,166 @@
+import time
+import threading
+import pytest
+from utils.inference_service import InferenceService, DummyModel
+
+
+class RecordingModel:
+    """记录每个批次大小的测试模型，输入为 "fail" 时整批失败"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batch_sizes = []
+        self.closed = False
+
+    def predict_batch(self, inputs):
+        self.batch_sizes.append(len(inputs))
+        time.sleep(self.delay)
+        if "fail" in inputs:
+            raise ValueError("bad input")
+        return [f"result:{data}" for data in inputs]
+
+    def close(self):
+        self.closed = True
+
+
+def submit_concurrently(service, inputs):
+    """多个线程同时提交请求，返回对应的 Future 列表"""
+    futures = [None] * len(inputs)
+    barrier = threading.Barrier(len(inputs))
+
+    def client(index):
+        barrier.wait()
+        futures[index] = service.submit(inputs[index])
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(len(inputs))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return futures
+
+
+def test_batch_size_is_capped():
+    model = RecordingModel(delay=0.01)
+    service = InferenceService(lambda: model, max_batch_size=4, max_latency_ms=50)
+    service.start()
+    try:
+        inputs = [str(i) for i in range(32)]
+        futures = submit_concurrently(service, inputs)
+        assert [f.result(timeout=5) for f in futures] == [
+            f"result:{data}" for data in inputs
+        ]
+    finally:
+        service.stop()
+    assert max(model.batch_sizes) <= 4
+    assert sum(model.batch_sizes) == 32
+    # 并发请求应被合并成批次
+    assert len(model.batch_sizes) < 32
+
+
+def test_single_request_dispatched_at_deadline():
+    model = RecordingModel()
+    service = InferenceService(lambda: model, max_batch_size=8, max_latency_ms=100)
+    service.start()
+    try:
+        start_time = time.perf_counter()
+        assert service.submit("a").result(timeout=5) == "result:a"
+        elapsed = time.perf_counter() - start_time
+    finally:
+        service.stop()
+    # 批次未满时等待到截止时间才分派，但不会无限等待
+    assert 0.08 <= elapsed < 1.0
+    assert model.batch_sizes == [1]
+
+
+def test_model_error_propagates_to_batch():
+    model = RecordingModel()
+    service = InferenceService(lambda: model, max_batch_size=1, max_latency_ms=1)
+    service.start()
+    try:
+        with pytest.raises(ValueError, match="bad input"):
+            service.submit("fail").result(timeout=5)
+        # 出错后服务仍然可用
+        assert service.submit("ok").result(timeout=5) == "result:ok"
+    finally:
+        service.stop()
+
+
+def test_factory_error_fails_queued_requests():
+    def factory():
+        time.sleep(0.2)
+        raise RuntimeError("load failed")
+
+    service = InferenceService(factory)
+    service.start(wait=False)
+    try:
+        queued = service.submit("a")
+        with pytest.raises(RuntimeError, match="load failed"):
+            queued.result(timeout=5)
+        with pytest.raises(RuntimeError, match="load failed"):
+            service.submit("b").result(timeout=5)
+    finally:
+        service.stop()
+
+
+def test_factory_error_raised_by_blocking_start():
+    def factory():
+        raise RuntimeError("load failed")
+
+    service = InferenceService(factory)
+    with pytest.raises(RuntimeError, match="load failed"):
+        service.start()
+    service.stop()
+
+
+def test_stop_drains_pending_requests():
+    model = RecordingModel(delay=0.02)
+    service = InferenceService(
+        lambda: model, max_batch_size=2, max_latency_ms=1, num_workers=2
+    )
+    service.start()
+    futures = [service.submit(str(i)) for i in range(20)]
+    service.stop()
+    assert all(f.done() for f in futures)
+    assert [f.result() for f in futures] == [f"result:{i}" for i in range(20)]
+    assert model.closed
+    with pytest.raises(RuntimeError):
+        service.submit("late")
+
+
+def test_dummy_model_results_match_inputs():
+    service = InferenceService(DummyModel, max_batch_size=4, max_latency_ms=1)
+    service.start()
+    try:
+        first = service.submit(b"abc").result(timeout=5)
+        second = service.submit("abc").result(timeout=5)
+    finally:
+        service.stop()
+    assert first == second
+    assert first["size"] == 3
+
+
+def test_swap_during_initial_load_keeps_new_model():
+    initial = RecordingModel()
+    loading = threading.Event()
+
+    def slow_factory():
+        loading.set()
+        time.sleep(0.2)
+        return initial
+
+    service = InferenceService(slow_factory, max_batch_size=1, max_latency_ms=1)
+    service.start(wait=False)
+    try:
+        loading.wait(timeout=5)
+        upgraded = RecordingModel()
+        retired = threading.Event()
+        service.swap_model(upgraded, "2.0.0", retired.set)
+        assert service.submit("a").result(timeout=5) == "result:a"
+        assert upgraded.batch_sizes == [1]
+        assert initial.batch_sizes == []
+        # 被替换的初始模型空闲后关闭
+        assert retired.wait(timeout=5)
+        assert initial.closed
+    finally:
+        service.stop()
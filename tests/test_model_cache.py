@@ -0,0 +1,61 @@
+from utils import inference_service
+from utils.model_cache import ModelCache
+from core.model_sync import ModelSyncEngine
+
+
+class CountingModel:
+    """报告占用内存的后端模型替身"""
+
+    memory_bytes = 10
+
+    def __init__(self, version):
+        self.version = version
+        self.closed = False
+
+    def predict_batch(self, inputs):
+        return [self.version for _ in inputs]
+
+    def close(self):
+        self.closed = True
+
+
+def make_engine(tmp_path, monkeypatch, budget_bytes):
+    built = []
+
+    def factory(model_file, version_info):
+        built.append(CountingModel(version_info["version"]))
+        return built[-1]
+
+    monkeypatch.setitem(inference_service._backends, "dummy", factory)
+    engine = ModelSyncEngine(model_dir=str(tmp_path))
+    engine.model_cache = ModelCache(budget_bytes)
+    versions = {}
+    for version in ("1", "2"):
+        name = f"cache_model_{version}.pt"
+        (tmp_path / name).write_bytes(b"weights" * 100)
+        versions[version] = {"version": version, "model_name": name}
+    return engine, versions, built
+
+
+def test_switching_back_reuses_built_model(tmp_path, monkeypatch):
+    engine, versions, built = make_engine(tmp_path, monkeypatch, budget_bytes=1024)
+    for version in ("1", "2", "1"):
+        model = engine.load_model(versions[version])
+        assert model.predict_batch([None]) == [version]
+        model.close()
+    assert [model.version for model in built] == ["1", "2"]
+    assert engine.model_cache.get_stats()["hits"] == 1
+
+
+def test_budget_uses_reported_size_and_skips_pinned(tmp_path, monkeypatch):
+    engine, versions, built = make_engine(tmp_path, monkeypatch, budget_bytes=15)
+    first = engine.load_model(versions["1"])
+    second = engine.load_model(versions["2"])
+    # 两个模型都在使用中，超出预算也不淘汰
+    assert not any(model.closed for model in built)
+
+    first.close()
+    first.close()  # 重复取消固定无效
+    assert built[0].closed and not built[1].closed
+    second.close()
+    assert engine.model_cache.get_stats()["bytes"] == 10
@@ -0,0 +1,150 @@
+import os
+import asyncio
+import hashlib
+import pytest
+from core.model_sync import ModelSyncEngine
+
+GOOD = b"good model" * 1024
+GOOD_HASH = hashlib.sha256(GOOD).hexdigest()
+
+
+class StubEngine(ModelSyncEngine):
+    """版本清单和下载内容由测试指定的同步引擎"""
+
+    def __init__(self, model_dir, payload, version="1.0.0"):
+        super().__init__(model_dir=model_dir)
+        self.payload = payload
+        self.version = version
+        self.downloads = 0
+
+    async def check_version(self):
+        latest = {
+            "version": self.version,
+            "model_name": f"model_{self.version}.pt",
+            "timestamp": "2024-01-01T00:00:00Z",
+            "sha256": GOOD_HASH,
+        }
+        success, local = self.read_local_version()
+        return not success or local["version"] != latest["version"], latest
+
+    def _fetch_model_file(self, version_info, dest_path, report_progress):
+        self.downloads += 1
+        with open(dest_path, "wb") as f:
+            f.write(self.payload)
+        report_progress(100)
+
+
+def test_valid_download_is_activated(tmp_path):
+    engine = StubEngine(str(tmp_path), GOOD)
+    updated, latest = asyncio.run(engine.sync())
+    assert updated
+    assert engine.current_model["version"] == "1.0.0"
+    assert (tmp_path / "model_1.0.0.pt").read_bytes() == GOOD
+    assert not (tmp_path / "model_1.0.0.pt.partial").exists()
+
+
+def test_corrupt_download_keeps_current_version(tmp_path):
+    asyncio.run(StubEngine(str(tmp_path), GOOD).sync())
+
+    engine = StubEngine(str(tmp_path), b"corrupt", version="2.0.0")
+    with pytest.raises(Exception, match="校验失败"):
+        asyncio.run(engine.sync())
+    # 校验失败的版本不会被激活，暂存文件被删除
+    success, local = engine.read_local_version()
+    assert success and local["version"] == "1.0.0"
+    assert not (tmp_path / "model_2.0.0.pt").exists()
+    assert not (tmp_path / "model_2.0.0.pt.partial").exists()
+
+
+def test_corrupt_active_model_is_downloaded_again(tmp_path):
+    engine = StubEngine(str(tmp_path), GOOD)
+    asyncio.run(engine.sync())
+    with open(os.path.join(tmp_path, "model_1.0.0.pt"), "wb") as f:
+        f.write(b"damaged")
+
+    updated, _ = asyncio.run(engine.sync())
+    assert updated
+    assert engine.downloads == 2
+    assert (tmp_path / "model_1.0.0.pt").read_bytes() == GOOD
+
+
+def test_model_is_hashed_once_per_download(tmp_path, monkeypatch):
+    hashed = []
+    verify_file = ModelSyncEngine._verify_file
+
+    def counting_verify(self, model_path, version_info):
+        hashed.append(model_path)
+        return verify_file(self, model_path, version_info)
+
+    monkeypatch.setattr(ModelSyncEngine, "_verify_file", counting_verify)
+    engine = StubEngine(str(tmp_path), GOOD)
+    asyncio.run(engine.sync())
+    assert len(hashed) == 1
+    assert engine.current_model["verified_size"] == len(GOOD)
+
+    # 已是最新版本且文件未变化时不再计算哈希
+    updated, _ = asyncio.run(StubEngine(str(tmp_path), GOOD).sync())
+    assert not updated
+    assert len(hashed) == 1
+
+
+def test_activation_during_gc_keeps_history_entry(tmp_path, monkeypatch):
+    from utils.model_gc import ModelGarbageCollector
+
+    engine = ModelSyncEngine(model_dir=str(tmp_path))
+    for version in ("1", "2", "3", "4"):
+        info = {"version": version, "model_name": f"m{version}.pt", "timestamp": ""}
+        (tmp_path / info["model_name"]).write_bytes(b"x")
+        engine._activate_version(info)
+
+    collect = ModelGarbageCollector.collect
+    activated = {"version": "5", "model_name": "m5.pt", "timestamp": ""}
+
+    def collect_while_activating(self, active_info, history):
+        result = collect(self, active_info, history)
+        # 模拟回收期间后台更新激活了新版本
+        engine._record_version_history(activated)
+        return result
+
+    monkeypatch.setattr(ModelGarbageCollector, "collect", collect_while_activating)
+    assert engine.run_garbage_collection() == 1
+    names = [info["model_name"] for info in engine._read_version_history()]
+    assert names == ["m2.pt", "m3.pt", "m4.pt", "m5.pt"]
+    assert not (tmp_path / "m1.pt").exists()
+
+
+def test_download_takes_over_paused_prefetch(tmp_path):
+    import threading
+    from stub_servers import ThrottledFileServer
+
+    server = ThrottledFileServer({"model_2.pt": GOOD}).start()
+    try:
+        engine = ModelSyncEngine(model_dir=str(tmp_path))
+        next_info = {
+            "version": "2.0.0",
+            "model_name": "model_2.pt",
+            "timestamp": "2024-01-01T00:00:00Z",
+            "sha256": GOOD_HASH,
+            "mirrors": [server.url],
+        }
+        # 用户一直不空闲，预取会一直暂停
+        prefetch = threading.Thread(
+            target=engine.run_prefetch, args=(next_info,), kwargs={"idle_seconds": 1e9}
+        )
+        prefetch.start()
+        staging = tmp_path / "model_2.pt.prefetch.partial"
+        for _ in range(100):
+            if staging.exists():
+                break
+            threading.Event().wait(0.05)
+        assert staging.exists()
+
+        engine.is_update_in_progress = True
+        asyncio.run(asyncio.wait_for(engine.download(next_info), timeout=10))
+        prefetch.join(timeout=10)
+    finally:
+        server.stop()
+    assert engine.current_model["version"] == "2.0.0"
+    assert (tmp_path / "model_2.pt").read_bytes() == GOOD
+    assert not staging.exists()
+    assert not (tmp_path / "model_2.pt.partial").exists()
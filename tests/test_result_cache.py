@@ -0,0 +1,111 @@
+import threading
+from utils.result_cache import ResultCache, input_digest
+from utils.inference_service import InferenceService
+
+
+def test_memory_and_disk_hits_return_same_type(tmp_path):
+    disk_path = str(tmp_path / "results.db")
+    digest = input_digest("query")
+
+    cache = ResultCache(disk_path=disk_path, disk_max_bytes=1024 * 1024)
+    cache.bind_version("1")
+    stored = cache.put(digest, (1, 2))
+    assert cache.get(digest) == (True, stored)
+    cache.close()
+
+    # 新实例只能从磁盘层命中
+    reopened = ResultCache(disk_path=disk_path, disk_max_bytes=1024 * 1024)
+    reopened.bind_version("1")
+    found, value = reopened.get(digest)
+    reopened.close()
+    assert found
+    assert value == stored
+    assert type(value) is type(stored)
+
+
+def test_memory_only_cache_keeps_original_object():
+    cache = ResultCache()
+    value = (1, 2)
+    assert cache.put("d", value) is value
+    assert cache.get("d") == (True, value)
+
+
+def test_memory_only_lookup_skips_disk(tmp_path):
+    cache = ResultCache(
+        memory_entries=1, disk_path=str(tmp_path / "r.db"), disk_max_bytes=1 << 20
+    )
+    cache.bind_version("1")
+    cache.put("a", [1])
+    cache.put("b", [2])  # 把 a 挤出内存层
+    assert cache.get("a", memory_only=True) == (False, None)
+    assert cache.get("a") == (True, [1])
+    cache.close()
+
+
+def test_version_change_invalidates_results(tmp_path):
+    cache = ResultCache(disk_path=str(tmp_path / "r.db"), disk_max_bytes=1 << 20)
+    cache.bind_version("1")
+    cache.put("d", [1])
+    cache.bind_version("2")
+    assert cache.get("d") == (False, None)
+    # 切换前开始的推理不会写入新版本的缓存
+    cache.put("d", [1], version="1")
+    assert cache.get("d") == (False, None)
+    cache.close()
+
+
+class TupleModel:
+    def __init__(self):
+        self.calls = 0
+
+    def predict_batch(self, inputs):
+        self.calls += 1
+        return [(len(data), data) for data in inputs]
+
+
+def test_service_results_consistent_across_tiers(tmp_path):
+    disk_path = str(tmp_path / "results.db")
+
+    def run(model):
+        cache = ResultCache(
+            memory_entries=4, disk_path=disk_path, disk_max_bytes=1 << 20
+        )
+        service = InferenceService(
+            lambda: model, max_latency_ms=1, result_cache=cache, model_version="1"
+        )
+        cache.bind_version("1")
+        service.start()
+        try:
+            first = service.submit("abc").result(timeout=5)
+            second = service.submit("abc").result(timeout=5)
+        finally:
+            service.stop()
+            cache.close()
+        return first, second
+
+    model = TupleModel()
+    computed, memory_hit = run(model)
+    disk_hit, _ = run(model)
+    assert computed == memory_hit == disk_hit
+    assert type(computed) is type(disk_hit)
+    # 第二次运行从磁盘层命中，不再进入模型
+    assert model.calls == 1
+
+
+def test_submit_does_not_wait_for_disk_io(tmp_path):
+    cache = ResultCache(disk_path=str(tmp_path / "r.db"), disk_max_bytes=1 << 20)
+    service = InferenceService(TupleModel, max_latency_ms=1, result_cache=cache)
+    service.start()
+    try:
+        # 磁盘层被占用时，提交请求仍立即返回
+        with cache._disk_lock:
+            submitted = threading.Event()
+            thread = threading.Thread(
+                target=lambda: (service.submit("x"), submitted.set())
+            )
+            thread.start()
+            assert submitted.wait(timeout=1)
+        thread.join()
+    finally:
+        service.stop()
+        cache.close()
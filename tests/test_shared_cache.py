@@ -0,0 +1,42 @@
+import os
+import stat
+import pytest
+from utils.shared_cache import SharedModelCache
+
+
+def test_failed_download_leaves_no_partial(tmp_path):
+    cache = SharedModelCache(str(tmp_path / "shared"))
+
+    def failing(dest_path, report):
+        with open(dest_path, "wb") as f:
+            f.write(b"half")
+        raise IOError("连接中断")
+
+    with pytest.raises(IOError):
+        cache.fetch("1_model.pt", failing)
+    assert not [name for name in os.listdir(cache.root) if name.endswith(".partial")]
+
+    def working(dest_path, report):
+        with open(dest_path, "wb") as f:
+            f.write(b"model")
+
+    path = cache.fetch("1_model.pt", working)
+    assert open(path, "rb").read() == b"model"
+
+
+def test_stale_partial_is_removed(tmp_path):
+    cache = SharedModelCache(str(tmp_path / "shared"))
+    stale = tmp_path / "shared" / "1_model.pt.99999.partial"
+    stale.write_bytes(b"stale")
+    cache.fetch("1_model.pt", lambda dest_path, report: open(dest_path, "wb").close())
+    assert not stale.exists()
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX 权限")
+def test_cache_dir_is_writable_by_all_users(tmp_path):
+    old_umask = os.umask(0o022)
+    try:
+        cache = SharedModelCache(str(tmp_path / "shared"))
+    finally:
+        os.umask(old_umask)
+    assert stat.S_IMODE(os.stat(cache.root).st_mode) == 0o777
@@ -0,0 +1,10 @@
+from utils import theme
+from utils.theme import get_theme
+
+
+def test_template_change_invalidates_disk_cache_key(monkeypatch):
+    engine = get_theme()
+    values = engine._collect_values()
+    before = engine._config_hash(values)
+    monkeypatch.setattr(theme, "THEME_TEMPLATE", theme.THEME_TEMPLATE + "\n")
+    assert engine._config_hash(values) != before